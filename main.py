@@ -5,12 +5,8 @@ from pathlib import Path
 
 import yaml
 
-from src.core.generator import Generator
-from src.core.parser import parse_post
-from src.cli.scaffold import create_post
-from src.cli.watch import start_watch
-from src.cli.deploy import deploy_to_github_pages
-from src.admin.app import run_admin
+# Subcommand modules are imported inside their command functions so that
+# quick commands like `new` and `--help` don't load Flask, Jinja2 or Markdown.
 
 
 def load_config(config_path: Path) -> dict:
@@ -22,14 +18,68 @@ def load_config(config_path: Path) -> dict:
         return yaml.safe_load(f)
 
 
-def cmd_build(config: dict) -> None:
-    """Build the static site."""
+def make_build_fn(config: dict):
+    """Return a callable that builds the site with the given config."""
+    def build_fn():
+        from src.core.generator import Generator
+        from src.core.parser import parse_post
+
+        generator = Generator(config=config, parse_post=parse_post)
+        generator.build()
+
+    return build_fn
+
+
+def cmd_build(config: dict, shard: str | None = None) -> None:
+    """Build the static site, or one shard of its post pages."""
+    if not shard:
+        make_build_fn(config)()
+        return
+
+    from src.core.generator import Generator
+    from src.core.parser import parse_post
+    from src.core.shards import parse_shard_spec
+
+    index, count = parse_shard_spec(shard)
+    Generator(config=config, parse_post=parse_post).build_shard(index, count)
+
+
+def cmd_merge(config: dict, count: int) -> None:
+    """Merge shard output into the final site."""
+    from src.core.generator import Generator
+    from src.core.parser import parse_post
+
+    Generator(config=config, parse_post=parse_post).merge(count)
+
+
+def cmd_batch(config_paths: list[str], workers: int | None = None) -> None:
+    """Build several sites, each from its own config file."""
+    from src.cli.batch import build_sites
+
+    paths = [Path(p) for p in dict.fromkeys(config_paths)]
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"Config file not found: {path}")
+
+    results = build_sites(paths, workers)
+    failed = sum(1 for r in results if not r['ok'])
+    if failed:
+        raise RuntimeError(f"{failed} of {len(results)} sites failed to build")
+
+
+def cmd_check(config: dict, full: bool = False, fail: bool = False) -> None:
+    """Check internal links and assets of the built site."""
+    from src.core.generator import Generator
+    from src.core.parser import parse_post
+
     generator = Generator(config=config, parse_post=parse_post)
-    generator.build()
+    generator.check_links(full=full, fail=fail or None)
 
 
 def cmd_new(config: dict, title: str) -> None:
     """Create a new post."""
+    from src.cli.scaffold import create_post
+
     content_dir = Path(config['content_dir'])
     filepath = create_post(title, content_dir)
     print(f"Created: {filepath}")
@@ -37,30 +87,42 @@ def cmd_new(config: dict, title: str) -> None:
 
 def cmd_watch(config: dict) -> None:
     """Watch for changes and auto-rebuild."""
-    def build_fn():
-        generator = Generator(config=config, parse_post=parse_post)
-        generator.build()
+    from src.cli.watch import start_watch
 
+    build_fn = make_build_fn(config)
     print("Initial build...")
     build_fn()
     start_watch(config, build_fn)
 
 
-def cmd_deploy(config: dict) -> None:
+def cmd_deploy(config: dict, incremental: bool = False) -> None:
     """Deploy to GitHub Pages."""
-    def build_fn():
-        generator = Generator(config=config, parse_post=parse_post)
-        generator.build()
+    from src.cli.deploy import deploy_incremental, deploy_to_github_pages
 
+    build_fn = make_build_fn(config)
     output_dir = Path(config['output_dir'])
-    deploy_to_github_pages(output_dir, build_fn)
+    if incremental:
+        deploy_incremental(output_dir, build_fn)
+    else:
+        deploy_to_github_pages(output_dir, build_fn)
+
+
+def cmd_publish(config: dict) -> None:
+    """Upload the site to the configured deploy target."""
+    from src.cli.publish import publish_site
+
+    target_config = config.get('deploy_target')
+    if not target_config:
+        raise ValueError("No 'deploy_target' section in config.yaml")
+    publish_site(Path(config['output_dir']), make_build_fn(config), target_config)
 
 
 def cmd_admin(config: dict) -> None:
     """Start the admin panel."""
-    def build_fn():
-        generator = Generator(config=config, parse_post=parse_post)
-        generator.build()
+    from src.admin.app import run_admin
+    from src.cli.deploy import deploy_to_github_pages
+
+    build_fn = make_build_fn(config)
 
     def deploy_fn():
         output_dir = Path(config['output_dir'])
@@ -78,7 +140,28 @@ def main() -> None:
     subparsers = parser.add_subparsers(dest='command')
 
     # Build command (default)
-    subparsers.add_parser('build', help='Build the static site')
+    build_parser = subparsers.add_parser('build', help='Build the static site')
+    build_parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='Render only shard I of N post pages (combine with merge)'
+    )
+
+    # Merge command
+    merge_parser = subparsers.add_parser('merge', help='Merge sharded build output')
+    merge_parser.add_argument('shards', type=int, metavar='N', help='Number of shards')
+
+    # Check command
+    check_parser = subparsers.add_parser('check', help='Check internal links in the built site')
+    check_parser.add_argument('--full', action='store_true', help='Reparse every page')
+    check_parser.add_argument(
+        '--fail', action='store_true', help='Exit non-zero if any link is broken'
+    )
+
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Build several sites concurrently')
+    batch_parser.add_argument('configs', nargs='+', help='config.yaml of each site')
+    batch_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
 
     # New post command
     new_parser = subparsers.add_parser('new', help='Create a new post')
@@ -88,7 +171,15 @@ def main() -> None:
     subparsers.add_parser('watch', help='Watch for changes and auto-rebuild')
 
     # Deploy command
-    subparsers.add_parser('deploy', help='Deploy to GitHub Pages')
+    deploy_parser = subparsers.add_parser('deploy', help='Deploy to GitHub Pages')
+    deploy_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Commit only files changed since the last deploy'
+    )
+
+    # Publish command
+    subparsers.add_parser('publish', help='Upload to the configured deploy target')
 
     # Admin command
     subparsers.add_parser('admin', help='Start the admin panel')
@@ -96,18 +187,28 @@ def main() -> None:
     args = parser.parse_args()
 
     try:
+        if args.command == 'batch':
+            cmd_batch(args.configs, args.workers)
+            return
+
         config = load_config(Path('config.yaml'))
 
         if args.command == 'new':
             cmd_new(config, args.title)
+        elif args.command == 'check':
+            cmd_check(config, args.full, args.fail)
+        elif args.command == 'merge':
+            cmd_merge(config, args.shards)
         elif args.command == 'watch':
             cmd_watch(config)
         elif args.command == 'deploy':
-            cmd_deploy(config)
+            cmd_deploy(config, args.incremental)
+        elif args.command == 'publish':
+            cmd_publish(config)
         elif args.command == 'admin':
             cmd_admin(config)
         else:
-            cmd_build(config)
+            cmd_build(config, getattr(args, 'shard', None))
 
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -0,0 +1,164 @@
+"""Differential check and benchmark of the frontmatter parser.
+
+A seeded fuzz corpus of frontmatter documents is run through
+extract_frontmatter and through the original implementation (the
+delimiter regex plus a YAML safe load), once with the loader the module
+uses (CSafeLoader when libyaml is present) and once with yaml.safe_load.
+Results and error types must match exactly. libyaml and the pure-Python
+loader disagree on a few inputs (e.g. a trailing tab after a plain
+scalar); those go through the fallback loader, so they are counted but
+not failed as long as the fast path itself never produced them. Both
+implementations are then timed on a typical post.
+
+Usage: python scripts/check_frontmatter.py [--cases N] [--seed S] [--runs N]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import frontmatter  # noqa: E402
+
+OLD_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n(.*)$', re.DOTALL)
+
+VALUES = [
+    'Hello World', 'C++ tips', "It's fine", 'Why?', 'a: b', '"quoted"', "'single'",
+    '"with \\" esc"', "'it''s'", '2024-05-01', '2024-02-30', '2024-05-01 10:00:00',
+    '12', '012', '0x1F', '1_000', '1.5', '1e3', '12:30', '-1', '.inf', 'NaN',
+    'true', 'False', 'yes', 'off', 'y', 'null', '~', '',
+    '[]', '[a, b]', '[python, Tutorial, 2024]', "['a, b', c]", '[a, ]', '[[a]]', '{a: 1}',
+    'x # comment', 'Ünïcödé title', '日本語', '&anchor', '*alias', '!tag x', '|', '>',
+    '@at', '`tick`', 'a - b', 'trailing   ', 'under_score', '_lead', 'a,b', '=', '%x',
+    'Hello!', 'a  b', '"a\tb"', 'x\t',
+]
+KEYS = ['title', 'date', 'slug', 'tags', 'publish', 'true', 'null', 'a-b', '_x', 'Key2',
+        '1key', 'has space', 'title ']
+OPENERS = ['---\n', '---\n', '--- \n', '---\n\n', '----\n', '---\r\n']
+CLOSERS = ['\n---\n', '\n---\n', '\n---  \n', '\n----\n', '\n---', '\n---\n\n\n  ',
+           '\n--- x\n---\n']
+BODIES = ['Body text\n', '', '\n\nMore\n---\nhr\n', '  indented']
+
+TYPICAL_POST = (
+    "---\n"
+    "title: Getting Started with Static Sites\n"
+    "date: 2024-05-01\n"
+    "slug: getting-started\n"
+    "tags: [python, web, tutorial]\n"
+    "publish: true\n"
+    "---\n\n"
+    + "Some body text for the post.\n" * 200
+)
+
+
+def old_extract(text: str, loader) -> tuple[dict, str]:
+    """The implementation extract_frontmatter replaced."""
+    match = OLD_PATTERN.match(text)
+    if not match:
+        raise ValueError("Invalid frontmatter format")
+    return yaml.load(match.group(1), Loader=loader), match.group(2)
+
+
+def _outcome(fn, text: str):
+    try:
+        return 'ok', fn(text)
+    except Exception as e:
+        return 'error', type(e).__name__
+
+
+def _fast_path(text: str) -> bool:
+    """True if the fast parser handles text without falling back to YAML."""
+    try:
+        frontmatter._parse_flat(frontmatter.split_frontmatter(text)[0])
+    except (frontmatter._Fallback, ValueError):
+        return False
+    return True
+
+
+def _document(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 6)):
+        r = rng.random()
+        if r < 0.05:
+            lines.append('# comment')
+        elif r < 0.08:
+            lines.append('')
+        elif r < 0.10:
+            lines.append('  nested: x')
+        elif r < 0.12:
+            lines.append('- item')
+        else:
+            key, value = rng.choice(KEYS), rng.choice(VALUES)
+            sep = rng.choice([': ', ': ', ': ', ':', ' : '])
+            lines.append(f"{key}{sep}{value}" if value else f"{key}:")
+    return rng.choice(OPENERS) + '\n'.join(lines) + rng.choice(CLOSERS) + rng.choice(BODIES)
+
+
+def corpus(cases: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [TYPICAL_POST] + [_document(rng) for _ in range(cases)]
+
+
+def _best_time(fn, text: str, runs: int, loops: int = 200) -> float:
+    """Best per-call time in microseconds."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn(text)
+        elapsed = (time.perf_counter() - start) / loops * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check and benchmark the frontmatter parser')
+    parser.add_argument('--cases', type=int, default=30000, help='Fuzzed documents')
+    parser.add_argument('--seed', type=int, default=0, help='Fuzz seed')
+    parser.add_argument('--runs', type=int, default=5, help='Benchmark runs')
+    args = parser.parse_args()
+
+    references = [(frontmatter.SafeLoader.__name__, frontmatter.SafeLoader)]
+    if frontmatter.SafeLoader is not yaml.SafeLoader:
+        references.append(('safe_load', yaml.SafeLoader))
+
+    texts = corpus(args.cases, args.seed)
+    failed = False
+    for name, loader in references:
+        mismatches = []
+        divergences = 0
+        for text in texts:
+            expected = _outcome(lambda t: old_extract(t, loader), text)
+            actual = _outcome(frontmatter.extract_frontmatter, text)
+            if expected == actual:
+                continue
+            if loader is not frontmatter.SafeLoader and not _fast_path(text) and \
+                    actual == _outcome(lambda t: old_extract(t, frontmatter.SafeLoader), text):
+                divergences += 1
+            else:
+                mismatches.append((text, expected, actual))
+
+        status = 'ok' if not mismatches else f"{len(mismatches)} MISMATCHES"
+        if divergences:
+            status += f" ({divergences} libyaml divergences)"
+        print(f"vs {name:<12} {len(texts)} documents  {status}")
+        for text, expected, actual in mismatches[:5]:
+            print(f"  {text!r}")
+            print(f"    expected {expected}")
+            print(f"    got      {actual}")
+        failed |= bool(mismatches)
+
+    old_us = _best_time(lambda t: old_extract(t, frontmatter.SafeLoader), TYPICAL_POST, args.runs)
+    new_us = _best_time(frontmatter.extract_frontmatter, TYPICAL_POST, args.runs)
+    print(f"typical post: old {old_us:8.1f} us  new {new_us:8.1f} us  ({old_us / new_us:.1f}x)")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
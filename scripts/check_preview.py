@@ -0,0 +1,87 @@
+"""Check that the block-by-block admin preview matches a whole-document render.
+
+Each sample document (built-in edge cases plus every post under content/)
+is rendered once whole with convert_markdown and once through
+PreviewEngine, whose blocks are joined the way the editor shows them. Any
+difference is printed and the script exits non-zero.
+
+Usage: python scripts/check_preview.py [content_dir ...]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.admin.preview import PreviewEngine  # noqa: E402
+from src.core.frontmatter import split_frontmatter  # noqa: E402
+from src.core.parser import convert_markdown  # noqa: E402
+
+SAMPLES = {
+    'paragraphs': "One\n\nTwo\nlines\n\nThree",
+    'headings': "# Title\n\nText\n\n## Section\n\nMore text\n\n---\n\nAfter rule",
+    'list': "- a\n- b\n\n- c\n\n  continued\n\n1. one\n2. two\n\nAfter",
+    'nested list': "- a\n\n    - nested\n\n- b\n\nText",
+    'quote': "> one\n> two\n\nText",
+    'quote paragraphs': "> first\n\n> second\n\n> third",
+    'quote after text': "Intro\n> quoted\n\n> more quote\n\nOutro",
+    'quote with list': "> - a\n> - b\n\n> tail",
+    'quote then text': "> a\n\nPlain\n\n> b",
+    'quote in list': "- item\n\n    > nested quote\n\n> top quote",
+    'lazy quote': "> a\nlazy line\n\n> b",
+    'fence': "```python\nx = 1\n\ny = 2\n```\n\nText",
+    'tilde fence': "~~~\n> not a quote\n\n<div>\n~~~\n\nText",
+    'indented code': "Text\n\n    code\n\n    more code\n\nText",
+    'table': "| a | b |\n|---|---|\n| 1 | 2 |\n\nText",
+    'html block': "<div>\n\nx\n\n</div>\n\nText",
+    'html single': "<div class=\"note\">Note</div>\n\nText",
+    'html comment': "<!--\n\ncomment\n\n-->\n\nText",
+    'inline html': "Some <em>inline</em> html\n\n<span>start</span> of line",
+    'reference link': "See [the site][home].\n\n[home]: https://example.com",
+    'setext': "Title\n=====\n\nText\n\nSub\n---",
+}
+
+
+def _documents(content_dirs: list[Path]) -> dict[str, str]:
+    docs = dict(SAMPLES)
+    for content_dir in content_dirs:
+        for path in sorted(content_dir.rglob('*.md')):
+            try:
+                _, body = split_frontmatter(path.read_text(encoding='utf-8'))
+            except ValueError:
+                continue
+            docs[str(path)] = body
+    return docs
+
+
+def preview_html(engine: PreviewEngine, text: str) -> str:
+    """The preview as the editor assembles it, one element per block."""
+    return '\n'.join(block['html'] for block in engine.render(text))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check block previews against full renders')
+    parser.add_argument('content_dirs', nargs='*', type=Path, default=[ROOT / 'content'],
+                        help='Directories of markdown posts to include')
+    args = parser.parse_args()
+
+    engine = PreviewEngine()
+    mismatches = []
+    docs = _documents(args.content_dirs)
+    for name, text in docs.items():
+        expected = convert_markdown(text)
+        actual = preview_html(engine, text)
+        if expected != actual:
+            mismatches.append((name, expected, actual))
+
+    print(f"{len(docs)} documents  {'ok' if not mismatches else f'{len(mismatches)} MISMATCHES'}")
+    for name, expected, actual in mismatches:
+        print(f"  {name}")
+        print(f"    whole   {expected!r}")
+        print(f"    preview {actual!r}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
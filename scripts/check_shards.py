@@ -0,0 +1,125 @@
+"""Check that a sharded build plus merge produces the same site as a full build.
+
+A temporary site is generated with timestamped post dates across several
+tags and a draft without a date. It is built once in full and once as N
+shards (run in parallel) merged twice, and the output trees must be
+byte-identical.
+
+Usage: python scripts/check_shards.py [--posts N] [--shards N]
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TAGS = ['python', 'web', 'notes', 'tools']
+
+
+def _write_site(base: Path, posts: int) -> Path:
+    content = base / 'content'
+    content.mkdir()
+    for i in range(posts):
+        tags = ', '.join(TAGS[j % len(TAGS)] for j in range(i % 3 + 1))
+        (content / f"post-{i}.md").write_text(
+            f"---\n"
+            f"title: Post {i}\n"
+            f"date: 2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:00\n"
+            f"tags: [{tags}]\n"
+            f"---\n\n"
+            f"Post {i} about {TAGS[i % len(TAGS)]} and shards.\n\n"
+            f"```python\nprint({i})\n```\n",
+            encoding='utf-8'
+        )
+    (content / 'draft.md').write_text(
+        "---\ntitle: Undated draft\npublish: false\n---\n\nNot published.\n",
+        encoding='utf-8'
+    )
+    return content
+
+
+def _site_config(site: Path, content: Path) -> Path:
+    site.mkdir()
+    (site / 'config.yaml').write_text(
+        f"site_name: Shard Check\n"
+        f"base_url: /\n"
+        f"content_dir: {content}\n"
+        f"output_dir: {site / 'dist'}\n"
+        f"cache_dir: {site / '.cache'}\n"
+        f"static_dir: {ROOT / 'static'}\n"
+        f"templates_dir: {ROOT / 'templates'}\n"
+        f"posts_per_page: 4\n",
+        encoding='utf-8'
+    )
+    return site
+
+
+def _main(args: list[str], cwd: Path) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(ROOT / 'main.py')] + args,
+                          cwd=cwd, capture_output=True, text=True)
+
+
+def _differences(left: Path, right: Path) -> list[str]:
+    """Relative paths that are missing on one side or differ in content."""
+    files = {}
+    for root in (left, right):
+        for path in root.rglob('*'):
+            if path.is_file():
+                files.setdefault(path.relative_to(root).as_posix(), []).append(root)
+    return sorted(
+        rel_path for rel_path, roots in files.items()
+        if len(roots) != 2 or (left / rel_path).read_bytes() != (right / rel_path).read_bytes()
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check sharded builds against a full build')
+    parser.add_argument('--posts', type=int, default=40, help='Generated posts')
+    parser.add_argument('--shards', type=int, default=3, help='Number of shards')
+    args = parser.parse_args()
+
+    base = Path(tempfile.mkdtemp(prefix='shards-'))
+    content = _write_site(base, args.posts)
+    full = _site_config(base / 'full', content)
+    sharded = _site_config(base / 'sharded', content)
+
+    result = _main(['build'], full)
+    if result.returncode != 0:
+        print("Error: full build failed")
+        print(result.stdout + result.stderr)
+        return 1
+
+    procs = [
+        subprocess.Popen([sys.executable, str(ROOT / 'main.py'), 'build',
+                          '--shard', f"{i}/{args.shards}"],
+                         cwd=sharded, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        for i in range(1, args.shards + 1)
+    ]
+    for i, proc in enumerate(procs, 1):
+        output, _ = proc.communicate()
+        if proc.returncode != 0:
+            print(f"Error: shard {i}/{args.shards} failed")
+            print(output)
+            return 1
+
+    failed = False
+    # Merge twice: merge must leave the shards intact
+    for attempt in (1, 2):
+        result = _main(['merge', str(args.shards)], sharded)
+        if result.returncode != 0:
+            print(f"Error: merge #{attempt} failed")
+            print(result.stdout + result.stderr)
+            return 1
+        diffs = _differences(full / 'dist', sharded / 'dist')
+        status = 'ok' if not diffs else f"{len(diffs)} DIFFERENCES"
+        print(f"merge #{attempt}: {args.posts} posts, {args.shards} shards  {status}")
+        for path in diffs[:10]:
+            print(f"  {path}")
+        failed |= bool(diffs)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Measure CLI startup time and fail if quick commands exceed their budget.
+
+Each command is run in a fresh interpreter several times and the best
+wall time is compared against the budget. Heavy modules that quick
+commands must never import are checked with `-X importtime`.
+
+Usage: python scripts/check_startup.py [--runs N] [--scale X]
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (arguments, budget in milliseconds)
+COMMANDS = [
+    (['--help'], 150),
+    (['new', 'Startup Check'], 150),
+]
+FORBIDDEN_MODULES = ['flask', 'werkzeug', 'jinja2', 'markdown', 'bleach', 'watchdog']
+
+
+def _run(args: list[str], cwd: Path, extra: list[str] | None = None) -> subprocess.CompletedProcess:
+    cmd = [sys.executable] + (extra or []) + [str(ROOT / 'main.py')] + args
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+
+
+def _imported_modules(stderr: str) -> set[str]:
+    """Top-level package names from `-X importtime` output."""
+    names = set()
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            names.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return names
+
+
+def _site_dir() -> Path:
+    """Temporary site with a config so `new` can run without touching the repo."""
+    site = Path(tempfile.mkdtemp(prefix='startup-'))
+    (site / 'config.yaml').write_text("content_dir: content\n", encoding='utf-8')
+    (site / 'content').mkdir()
+    return site
+
+
+def _clear_posts(site: Path) -> None:
+    for post in (site / 'content').glob('*.md'):
+        post.unlink()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check CLI startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply budgets, e.g. for slow CI machines')
+    args = parser.parse_args()
+
+    site = _site_dir()
+    failed = False
+
+    for cmd_args, budget in COMMANDS:
+        budget *= args.scale
+        best = None
+        for _ in range(args.runs):
+            _clear_posts(site)
+            start = time.perf_counter()
+            result = _run(cmd_args, site)
+            elapsed = (time.perf_counter() - start) * 1000
+            if result.returncode != 0:
+                print(f"Error: {' '.join(cmd_args)} exited with {result.returncode}")
+                print(result.stdout + result.stderr)
+                return 1
+            best = elapsed if best is None else min(best, elapsed)
+
+        status = 'ok' if best <= budget else 'OVER BUDGET'
+        print(f"{' '.join(cmd_args):<20} {best:7.1f} ms  (budget {budget:.0f} ms)  {status}")
+        failed |= best > budget
+
+        _clear_posts(site)
+        heavy = _imported_modules(_run(cmd_args, site, ['-X', 'importtime']).stderr)
+        heavy &= set(FORBIDDEN_MODULES)
+        if heavy:
+            print(f"  imports heavy modules: {', '.join(sorted(heavy))}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
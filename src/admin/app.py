@@ -2,13 +2,20 @@
 import os
 import re
 from datetime import date
+from functools import partial
 from pathlib import Path
 
-import markdown
-import yaml
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify
 from werkzeug.utils import secure_filename
 
+from src.admin.images import ImageProcessor, UploadTooLarge, store_upload
+from src.admin.index import PostIndex, decode_cursor, encode_cursor
+from src.admin.preview import PreviewEngine
+from src.core.frontmatter import parse_frontmatter
+from src.core.highlight import create_highlighter, render_fingerprint
+from src.core.parser import parse_post
+from src.core.store import ContentStore
+
 
 def create_app(config: dict, build_fn, deploy_fn):
     """Create and configure the Flask admin app."""
@@ -21,50 +28,84 @@ def create_app(config: dict, build_fn, deploy_fn):
 
     content_dir = Path(config['content_dir'])
     images_dir = content_dir / 'images'
-
-    def get_all_posts():
-        """Load all posts from content directory."""
-        posts = []
-        for filepath in sorted(content_dir.glob('*.md'), reverse=True):
-            if filepath.name == 'about.md':
-                continue
-            try:
-                text = filepath.read_text(encoding='utf-8')
-                if text.startswith('---'):
-                    parts = text.split('---', 2)
-                    if len(parts) >= 3:
-                        fm = yaml.safe_load(parts[1])
-                        posts.append({
-                            'title': fm.get('title', 'Untitled'),
-                            'slug': fm.get('slug', filepath.stem),
-                            'date': fm.get('date', date.today()),
-                            'tags': fm.get('tags', []),
-                            'draft': not fm.get('publish', True),
-                            'filename': filepath.name
-                        })
-            except Exception:
-                continue
-        return sorted(posts, key=lambda p: p['date'], reverse=True)
+    max_upload_size = config.get('max_upload_size', 10 * 1024 * 1024)
+    # Reject oversized requests before reading the body (multipart overhead allowed)
+    app.config['MAX_CONTENT_LENGTH'] = max_upload_size + 64 * 1024
+    image_processor = ImageProcessor(images_dir, config.get('image_variants', [480, 960]))
+    content_ignore = config.get('content_ignore')
+    # Same highlighting as the build, so the index and previews match dist/
+    highlighter = create_highlighter(config)
+    parse = partial(parse_post, highlighter=highlighter) if highlighter else parse_post
+    preview_engine = PreviewEngine(highlighter=highlighter)
+    store = None
+    if config.get('content_index'):
+        store = ContentStore(Path(config['content_index']), parse,
+                             render_fingerprint(highlighter))
+
+    post_index = None if store else PostIndex(content_dir, content_ignore)
+
+    def list_posts(search='', tag=None, draft=None, sort='date', limit=None, cursor=None):
+        """Query the post index; returns (posts, next_cursor)."""
+        after = decode_cursor(cursor)
+        fetch = limit + 1 if limit is not None else None
+        if store:
+            store.sync(content_dir, content_ignore)
+            rows = store.query(search, tag, draft, sort, fetch, after)
+        else:
+            post_index.refresh()
+            rows = post_index.query(search, tag, draft, sort, fetch, after)
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1], sort)
+
+        posts = [
+            {
+                'title': row['title'],
+                'slug': row['slug'],
+                'date': str(row['date'] or date.today()),
+                'tags': row['tags'],
+                'draft': row['draft'],
+                'filename': row['rel_path']
+            }
+            for row in rows
+        ]
+        return posts, next_cursor
 
     def get_post(slug: str):
         """Load a single post by slug."""
-        for filepath in content_dir.glob('*.md'):
-            text = filepath.read_text(encoding='utf-8')
-            if text.startswith('---'):
-                parts = text.split('---', 2)
-                if len(parts) >= 3:
-                    fm = yaml.safe_load(parts[1])
-                    if fm.get('slug') == slug:
-                        return {
-                            'title': fm.get('title', ''),
-                            'slug': fm.get('slug', ''),
-                            'date': fm.get('date', date.today()),
-                            'tags': fm.get('tags', []),
-                            'publish': fm.get('publish', True),
-                            'content': parts[2].strip(),
-                            'filepath': filepath
-                        }
-        return None
+        if store:
+            row = store.get_by_slug(slug)
+            if not row:
+                return None
+            return {
+                'title': row['title'],
+                'slug': row['slug'],
+                'date': row['date'] or date.today(),
+                'tags': row['tags'],
+                'publish': not row['draft'],
+                'content': row['content'].strip(),
+                'filepath': content_dir / row['rel_path']
+            }
+
+        post_index.refresh()
+        rel_path = post_index.find_slug(slug)
+        if not rel_path:
+            return None
+        filepath = content_dir / rel_path
+        text = filepath.read_text(encoding='utf-8')
+        parts = text.split('---', 2)
+        fm = parse_frontmatter(parts[1])
+        return {
+            'title': fm.get('title', ''),
+            'slug': fm.get('slug', ''),
+            'date': fm.get('date', date.today()),
+            'tags': fm.get('tags', []),
+            'publish': fm.get('publish', True),
+            'content': parts[2].strip(),
+            'filepath': filepath
+        }
 
     def slugify(title: str) -> str:
         """Convert title to URL-friendly slug."""
@@ -73,8 +114,8 @@ def create_app(config: dict, build_fn, deploy_fn):
         slug = re.sub(r'[\s_]+', '-', slug)
         return slug.strip('-')
 
-    def save_post(title, slug, post_date, tags, content, publish):
-        """Save post to markdown file."""
+    def save_post(title, slug, post_date, tags, content, publish, directory=None):
+        """Save post to markdown file (in `directory`, default content root)."""
         if isinstance(tags, str):
             tags = [t.strip() for t in tags.split(',') if t.strip()]
 
@@ -96,15 +137,45 @@ publish: {str(publish).lower()}
 
 {content}
 """
-        filepath = content_dir / f"{slug}.md"
+        filepath = (directory or content_dir) / f"{slug}.md"
         filepath.write_text(md_content, encoding='utf-8')
+        if store:
+            store.update_file(content_dir, filepath)
         return filepath
 
+    def remove_post_file(filepath: Path):
+        """Delete a post file and drop it from the index."""
+        filepath.unlink()
+        if store:
+            store.remove_file(content_dir, filepath)
+
     @app.route('/')
     def dashboard():
-        """Show all posts."""
-        posts = get_all_posts()
-        return render_template('dashboard.html', posts=posts)
+        """Show the dashboard shell; posts are loaded from /api/posts."""
+        filters = {
+            'q': request.args.get('q', '').strip(),
+            'tag': request.args.get('tag', '').strip().lower(),
+            'status': request.args.get('status', ''),
+            'sort': request.args.get('sort', 'date')
+        }
+        return render_template('dashboard.html', filters=filters)
+
+    @app.route('/api/posts')
+    def api_posts():
+        """List posts as JSON with cursor pagination, filters and sorting."""
+        search = request.args.get('q', '').strip()
+        tag = request.args.get('tag', '').strip().lower() or None
+        draft = {'draft': True, 'published': False}.get(request.args.get('status', ''))
+        sort = request.args.get('sort', 'date')
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+
+        posts, next_cursor = list_posts(
+            search, tag, draft, sort, limit, request.args.get('cursor')
+        )
+        return jsonify({'posts': posts, 'next_cursor': next_cursor})
 
     @app.route('/new', methods=['GET', 'POST'])
     def new_post():
@@ -134,11 +205,13 @@ publish: {str(publish).lower()}
             publish = request.form.get('publish') == 'on'
 
             old_post = get_post(slug)
+            directory = None
             if old_post and old_post['filepath'].exists():
+                directory = old_post['filepath'].parent
                 if new_slug != slug:
-                    old_post['filepath'].unlink()
+                    remove_post_file(old_post['filepath'])
 
-            save_post(title, new_slug, post_date, tags, content, publish)
+            save_post(title, new_slug, post_date, tags, content, publish, directory)
             return redirect(url_for('dashboard'))
 
         post = get_post(slug)
@@ -157,7 +230,7 @@ publish: {str(publish).lower()}
         """Delete a post."""
         post = get_post(slug)
         if post and post['filepath'].exists():
-            post['filepath'].unlink()
+            remove_post_file(post['filepath'])
         return redirect(url_for('dashboard'))
 
     @app.route('/upload', methods=['POST'])
@@ -170,20 +243,46 @@ publish: {str(publish).lower()}
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
 
-        images_dir.mkdir(parents=True, exist_ok=True)
         filename = secure_filename(file.filename)
-        filepath = images_dir / filename
-        file.save(str(filepath))
-
-        markdown_syntax = f'![{filename}](/images/{filename})'
-        return jsonify({'markdown': markdown_syntax, 'path': f'/images/{filename}'})
+        try:
+            name, created = store_upload(file.stream, filename, images_dir, max_upload_size)
+        except UploadTooLarge as e:
+            return jsonify({'error': str(e)}), 413
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if created:
+            image_processor.submit(name)
+
+        alt = Path(filename).stem or name
+        markdown_syntax = f'![{alt}](/images/{name})'
+        return jsonify({
+            'markdown': markdown_syntax,
+            'path': f'/images/{name}',
+            'duplicate': not created
+        })
+
+    @app.errorhandler(413)
+    def request_too_large(error):
+        """Return JSON when an upload exceeds MAX_CONTENT_LENGTH."""
+        return jsonify({'error': f'Image exceeds {max_upload_size} bytes'}), 413
+
+    @app.context_processor
+    def highlight_context():
+        return {'highlight_code': highlighter is not None}
+
+    @app.route('/highlight.css')
+    def highlight_css():
+        """Stylesheet for build-time highlighted code in previews."""
+        css = highlighter.stylesheet() if highlighter else ''
+        return Response(css, mimetype='text/css')
 
     @app.route('/preview', methods=['POST'])
     def preview():
-        """Render markdown preview."""
+        """Render markdown preview, sending HTML only for blocks the editor lacks."""
         content = request.form.get('content', '')
-        html = markdown.markdown(content, extensions=['fenced_code', 'tables'])
-        return html
+        known = set(filter(None, request.form.get('known', '').split(',')))
+        return jsonify({'blocks': preview_engine.render(content, known)})
 
     @app.route('/build', methods=['POST'])
     def build():
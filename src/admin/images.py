@@ -0,0 +1,108 @@
+"""Content-addressed image storage and background variant generation."""
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'}
+RASTER_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp'}
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def store_upload(stream, filename: str, images_dir: Path, max_size: int) -> tuple[str, bool]:
+    """Stream an upload to disk under its content hash.
+
+    The file is written in chunks to a temporary file while being hashed,
+    then renamed to `<sha256 prefix><ext>`. Returns (stored name, created);
+    created is False when an identical image already existed.
+    """
+    ext = Path(filename).suffix.lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise ValueError(f"Unsupported image type: {ext or 'none'}")
+
+    images_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=images_dir, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"Image exceeds {max_size} bytes")
+                digest.update(chunk)
+                tmp.write(chunk)
+
+        name = f"{digest.hexdigest()[:20]}{ext}"
+        target = images_dir / name
+        if target.exists():
+            os.unlink(tmp_name)
+            return name, False
+        os.replace(tmp_name, target)
+        return name, True
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class ImageProcessor:
+    """Generate resized variants on a background thread.
+
+    Variants are written to images/variants/<stem>-<width><ext>. Without
+    Pillow installed, jobs are accepted and skipped.
+    """
+
+    def __init__(self, images_dir: Path, widths: list[int]):
+        self.images_dir = images_dir
+        self.widths = sorted(set(widths))
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str) -> None:
+        """Queue variant generation for a stored image."""
+        if PIL_AVAILABLE and self.widths and Path(name).suffix.lower() in RASTER_EXTENSIONS:
+            self._queue.put(name)
+
+    def join(self) -> None:
+        """Wait until all queued images are processed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            name = self._queue.get()
+            try:
+                self._make_variants(name)
+            except Exception as e:
+                print(f"Error processing image {name}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _make_variants(self, name: str) -> None:
+        source = self.images_dir / name
+        out_dir = self.images_dir / 'variants'
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as img:
+            for width in self.widths:
+                target = out_dir / f"{source.stem}-{width}{source.suffix}"
+                if target.exists() or img.width <= width:
+                    continue
+                height = round(img.height * width / img.width)
+                img.resize((width, height)).save(target)
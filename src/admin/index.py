@@ -0,0 +1,148 @@
+"""In-memory post index and cursor helpers for the admin listing API."""
+import base64
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+from src.core.frontmatter import parse_frontmatter
+from src.core.store import title_matches
+from src.utils import file_handler
+
+SORT_FIELDS = {
+    'date': ('date', True),
+    '-date': ('date', False),
+    'title': ('title_key', False),
+    '-title': ('title_key', True),
+}
+
+
+def sort_spec(sort: str) -> tuple[str, bool]:
+    """Return (field, descending) for a sort name, defaulting to newest first."""
+    return SORT_FIELDS.get(sort, SORT_FIELDS['date'])
+
+
+def encode_cursor(item: dict, sort: str) -> str:
+    """Opaque cursor pointing just after item in the given sort order."""
+    field, _ = sort_spec(sort)
+    value = item[field]
+    # Index rows carry date objects; the store compares their ISO form
+    if value is None:
+        value = ''
+    elif isinstance(value, date):
+        value = value.isoformat()
+    data = json.dumps([str(value), item['rel_path']])
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, str] | None:
+    """Decode a cursor into (sort value, rel_path); invalid cursors yield None."""
+    if not cursor:
+        return None
+    try:
+        value, rel_path = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(value), str(rel_path)
+    except (ValueError, TypeError):
+        return None
+
+
+def _read_meta(content_file: file_handler.ContentFile) -> dict | None:
+    """Read the frontmatter of a post file into a listing entry."""
+    text = content_file.path.read_text(encoding='utf-8')
+    if not text.startswith('---'):
+        return None
+    parts = text.split('---', 2)
+    if len(parts) < 3:
+        return None
+    fm = parse_frontmatter(parts[1]) or {}
+    title = str(fm.get('title', 'Untitled'))
+    tags = fm.get('tags') or []
+    return {
+        'title': title,
+        'title_key': title.lower(),
+        'slug': fm.get('slug', content_file.path.stem),
+        'date': str(fm.get('date', date.today())),
+        'tags': [str(t).lower().strip() for t in tags],
+        'draft': not fm.get('publish', True),
+        'rel_path': content_file.rel_path,
+    }
+
+
+class PostIndex:
+    """Frontmatter of every post, refreshed by stat so unchanged files are never reread."""
+
+    def __init__(self, content_dir: Path, ignore: list[str] | None = None):
+        self.content_dir = content_dir
+        self.ignore = ignore
+        self._entries: dict[str, tuple[float, int, dict | None]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        files = [
+            f for f in file_handler.scan_markdown_files(self.content_dir, self.ignore)
+            if f.rel_path != 'about.md'
+        ]
+        with self._lock:
+            present = set()
+            for f in files:
+                present.add(f.rel_path)
+                known = self._entries.get(f.rel_path)
+                if known and known[0] == f.mtime and known[1] == f.size:
+                    continue
+                try:
+                    meta = _read_meta(f)
+                except Exception:
+                    meta = None
+                self._entries[f.rel_path] = (f.mtime, f.size, meta)
+            for rel_path in set(self._entries) - present:
+                del self._entries[rel_path]
+
+    def find_slug(self, slug: str) -> str | None:
+        """Return the relative path of the post with this slug.
+
+        If several files share the slug, the first by path wins, matching
+        the post the generator keeps.
+        """
+        with self._lock:
+            matches = [
+                rel_path for rel_path, (_, _, meta) in self._entries.items()
+                if meta and meta['slug'] == slug
+            ]
+        return min(matches) if matches else None
+
+    def query(
+        self,
+        search: str = '',
+        tag: str | None = None,
+        draft: bool | None = None,
+        sort: str = 'date',
+        limit: int | None = None,
+        after: tuple[str, str] | None = None
+    ) -> list[dict]:
+        """Filter and sort entries, returning at most limit items after the cursor."""
+        with self._lock:
+            items = [meta for _, _, meta in self._entries.values() if meta]
+
+        if search:
+            items = [m for m in items if title_matches(m['title'], search)]
+        if tag:
+            items = [m for m in items if tag in m['tags']]
+        if draft is not None:
+            items = [m for m in items if m['draft'] == draft]
+
+        field, descending = sort_spec(sort)
+        # Primary key in the requested direction, rel_path ascending as tiebreaker
+        items.sort(key=lambda m: m['rel_path'])
+        items.sort(key=lambda m: m[field], reverse=descending)
+
+        if after:
+            value, rel_path = after
+
+            def is_after(m):
+                if m[field] == value:
+                    return m['rel_path'] > rel_path
+                return m[field] < value if descending else m[field] > value
+
+            items = [m for m in items if is_after(m)]
+
+        return items[:limit] if limit is not None else items
@@ -0,0 +1,119 @@
+"""Block-level incremental Markdown preview for the admin editor."""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from src.core.parser import convert_markdown
+
+FENCE_PATTERN = re.compile(r'^(```|~~~)')
+LIST_PATTERN = re.compile(r'^\s{0,3}([-*+]|\d+[.)])\s')
+QUOTE_PATTERN = re.compile(r'^ {0,3}>', re.MULTILINE)
+REFERENCE_PATTERN = re.compile(r'^\s{0,3}\[[^\]]+\]:\s', re.MULTILINE)
+# Raw HTML (tags or comments) at the start of a line; such blocks may span
+# blank lines, so documents containing them are rendered whole
+HTML_BLOCK_PATTERN = re.compile(r'^ {0,3}<[A-Za-z!/?]', re.MULTILINE)
+
+
+def split_blocks(text: str) -> list[str]:
+    """Split a document into top-level blocks that render independently.
+
+    Blocks are separated by blank lines, except that fenced code stays
+    together and indented continuations, list items and quote paragraphs
+    are merged into the preceding block so lists, blockquotes and nested
+    content render as a whole.
+    """
+    blocks = []
+    current = []
+    fence = None
+
+    def flush():
+        if current:
+            blocks.append('\n'.join(current))
+            current.clear()
+
+    for line in text.replace('\r\n', '\n').split('\n'):
+        if fence:
+            current.append(line)
+            if line.strip().startswith(fence):
+                fence = None
+            continue
+        match = FENCE_PATTERN.match(line.strip())
+        if match:
+            current.append(line)
+            fence = match.group(1)
+            continue
+        if line.strip():
+            current.append(line)
+        else:
+            flush()
+    flush()
+
+    merged = []
+    for block in blocks:
+        first = block.split('\n', 1)[0]
+        continues = first.startswith((' ', '\t')) or (
+            LIST_PATTERN.match(first) and merged and LIST_PATTERN.match(merged[-1])
+        ) or (
+            # Markdown appends a quote to a blockquote that ends the previous block
+            QUOTE_PATTERN.match(first) and merged and QUOTE_PATTERN.search(merged[-1])
+        )
+        if merged and continues:
+            merged[-1] += '\n\n' + block
+        else:
+            merged.append(block)
+    return merged
+
+
+def block_hash(block: str) -> str:
+    return hashlib.sha1(block.encode('utf-8')).hexdigest()[:16]
+
+
+class PreviewEngine:
+    """Render previews block by block with an LRU cache of sanitized HTML.
+
+    Each block goes through the production convert_markdown, with the
+    site's code highlighter when it has one, so preview output matches a
+    real build. Documents using reference-style links or raw HTML blocks
+    are rendered whole, since definitions can affect any block and HTML
+    blocks can span blank lines.
+    """
+
+    def __init__(self, max_blocks: int = 4096, highlighter=None):
+        self.max_blocks = max_blocks
+        self.highlighter = highlighter
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render_block(self, digest: str, block: str) -> str:
+        with self._lock:
+            html = self._cache.get(digest)
+            if html is not None:
+                self._cache.move_to_end(digest)
+                return html
+        html = convert_markdown(block, self.highlighter)
+        with self._lock:
+            self._cache[digest] = html
+            while len(self._cache) > self.max_blocks:
+                self._cache.popitem(last=False)
+        return html
+
+    def render(self, text: str, known: set[str] = frozenset()) -> list[dict]:
+        """Return the document's blocks in order.
+
+        Blocks whose hash is in `known` (already shown by the editor)
+        carry only their hash; new blocks include rendered HTML.
+        """
+        if REFERENCE_PATTERN.search(text) or HTML_BLOCK_PATTERN.search(text):
+            blocks = [text]
+        else:
+            blocks = split_blocks(text)
+
+        result = []
+        for block in blocks:
+            digest = block_hash(block)
+            if digest in known:
+                result.append({'hash': digest})
+            else:
+                result.append({'hash': digest, 'html': self._render_block(digest, block)})
+        return result
@@ -0,0 +1,105 @@
+"""Batch builds of many sites in one invocation.
+
+Sites are built concurrently in a shared process pool. Each worker process
+imports the generator once and keeps one Jinja2 environment per templates
+directory and one Markdown converter, so sites built by the same worker
+reuse compiled templates instead of starting from scratch.
+"""
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import yaml
+
+PATH_KEYS = ('content_dir', 'output_dir', 'static_dir', 'templates_dir', 'cache_dir', 'content_index')
+
+_environments = {}
+
+
+def load_site_config(config_path: Path) -> dict:
+    """Load a site config, resolving its paths relative to the config file."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+
+    config.setdefault('cache_dir', '.cache')
+    base = config_path.resolve().parent
+    for key in PATH_KEYS:
+        if config.get(key):
+            config[key] = str(base / config[key])
+    return config
+
+
+def _environment(templates_dir: str):
+    """Jinja2 environment shared by every site in this worker using templates_dir."""
+    from jinja2 import Environment, FileSystemLoader
+
+    if templates_dir not in _environments:
+        _environments[templates_dir] = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=True
+        )
+    return _environments[templates_dir]
+
+
+def build_site(config_path: str) -> dict:
+    """Build one site in a worker, capturing its output. Never raises."""
+    from src.core.generator import Generator
+    from src.core.parser import parse_post
+
+    start = time.perf_counter()
+    log = io.StringIO()
+    error = ''
+    try:
+        with redirect_stdout(log):
+            config = load_site_config(Path(config_path))
+            env = _environment(config['templates_dir'])
+            Generator(config=config, parse_post=parse_post, env=env).build()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return {
+        'config': config_path,
+        'ok': not error,
+        'seconds': time.perf_counter() - start,
+        'log': log.getvalue(),
+        'error': error,
+    }
+
+
+def build_sites(config_paths: list[Path], workers: int | None = None) -> list[dict]:
+    """Build all sites concurrently and print a per-site summary."""
+    workers = workers or min(len(config_paths), os.cpu_count() or 1)
+    start = time.perf_counter()
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build_site, str(path)): str(path) for path in config_paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['config']] = result
+            status = 'ok' if result['ok'] else 'FAILED'
+            print(f"[{len(results)}/{len(futures)}] {result['config']}: {status}")
+            for line in result['log'].splitlines():
+                print(f"    {line}")
+
+    ordered = [results[str(path)] for path in config_paths]
+    _print_summary(ordered, time.perf_counter() - start, workers)
+    return ordered
+
+
+def _print_summary(results: list[dict], elapsed: float, workers: int) -> None:
+    width = max(len(r['config']) for r in results)
+    print()
+    print(f"{'Site':<{width}}  {'Status':<6}  {'Time':>8}")
+    for r in results:
+        status = 'ok' if r['ok'] else 'failed'
+        print(f"{r['config']:<{width}}  {status:<6}  {r['seconds']:7.2f}s")
+        if r['error']:
+            print(f"    {r['error']}")
+
+    failed = sum(1 for r in results if not r['ok'])
+    print(f"\n{len(results) - failed}/{len(results)} sites built in {elapsed:.2f}s "
+          f"with {workers} workers")
@@ -3,13 +3,18 @@ import subprocess
 import sys
 from pathlib import Path
 
+from src.utils.manifest import build_manifest, diff_manifests, load_manifest, save_manifest
 
-def run_git(args: list[str], cwd: Path) -> bool:
+MANIFEST_NAME = 'deploy-manifest.json'
+
+
+def run_git(args: list[str], cwd: Path, input: str | None = None) -> bool:
     """Run a git command and return success status."""
     try:
         result = subprocess.run(
             ['git'] + args,
             cwd=cwd,
+            input=input,
             capture_output=True,
             text=True
         )
@@ -50,12 +55,7 @@ def deploy_to_github_pages(output_dir: Path, build_fn) -> None:
     print("Building site...")
     build_fn()
 
-    git_dir = output_dir / '.git'
-    if not git_dir.exists():
-        print("Initializing git in dist/...")
-        run_git(['init'], output_dir)
-        run_git(['checkout', '-b', 'gh-pages'], output_dir)
-        run_git(['remote', 'add', 'origin', remote_url], output_dir)
+    _init_deploy_repo(output_dir, remote_url)
 
     print("Staging files...")
     run_git(['add', '-A'], output_dir)
@@ -67,12 +67,107 @@ def deploy_to_github_pages(output_dir: Path, build_fn) -> None:
     success = run_git(['push', '-f', 'origin', 'gh-pages'], output_dir)
 
     if success:
-        repo_name = remote_url.split('/')[-1].replace('.git', '')
-        user = remote_url.split('/')[-2]
-        if 'github.com' in remote_url:
-            print(f"\nDeployed! Your site will be available at:")
-            print(f"  https://{user}.github.io/{repo_name}/")
-            print("\nNote: Enable GitHub Pages in repo Settings > Pages > gh-pages branch")
+        save_manifest(output_dir / '.git' / MANIFEST_NAME, build_manifest(output_dir))
+        _print_pages_url(remote_url)
     else:
         print("\nPush failed. Check your git credentials and try again.")
         sys.exit(1)
+
+
+def _init_deploy_repo(output_dir: Path, remote_url: str) -> None:
+    """Initialize the gh-pages repository inside the output directory."""
+    git_dir = output_dir / '.git'
+    if not git_dir.exists():
+        print("Initializing git in dist/...")
+        run_git(['init'], output_dir)
+        run_git(['checkout', '-b', 'gh-pages'], output_dir)
+        run_git(['remote', 'add', 'origin', remote_url], output_dir)
+
+
+def _print_pages_url(remote_url: str) -> None:
+    """Print the GitHub Pages URL for a GitHub remote."""
+    if 'github.com' not in remote_url:
+        return
+    repo_name = remote_url.split('/')[-1].replace('.git', '')
+    user = remote_url.split('/')[-2]
+    print(f"\nDeployed! Your site will be available at:")
+    print(f"  https://{user}.github.io/{repo_name}/")
+    print("\nNote: Enable GitHub Pages in repo Settings > Pages > gh-pages branch")
+
+
+def deploy_incremental(output_dir: Path, build_fn, remote_url: str | None = None) -> bool:
+    """Deploy only the files that changed since the last deploy.
+
+    The new build is diffed against the manifest stored in dist/.git, and
+    only added, modified and deleted paths are staged. A commit is made
+    only when something is actually staged, and gh-pages is pushed
+    whenever it is ahead of origin, so a failed push is retried on the
+    next run. Returns True if commits were pushed.
+    """
+    remote_url = remote_url or get_remote_url()
+    if not remote_url:
+        print("Error: No git remote found. Set up a GitHub repository first.")
+        print("  git remote add origin https://github.com/USER/REPO.git")
+        sys.exit(1)
+
+    print(f"Deploying to: {remote_url}")
+    print("Building site...")
+    build_fn()
+
+    _init_deploy_repo(output_dir, remote_url)
+
+    manifest_path = output_dir / '.git' / MANIFEST_NAME
+    old_manifest = load_manifest(manifest_path)
+    new_manifest = build_manifest(output_dir)
+    diff = diff_manifests(old_manifest, new_manifest)
+
+    if not diff.is_empty():
+        print(f"Staging {diff.summary()}...")
+        pathspecs = '\0'.join(diff.changed)
+        if not run_git(['add', '-A', '--pathspec-from-file=-', '--pathspec-file-nul'],
+                       output_dir, input=pathspecs):
+            print("\nStaging failed.")
+            sys.exit(1)
+
+        # Paths can differ from the manifest yet match the last commit,
+        # e.g. after a failed push or with no stored manifest
+        if run_git(['diff', '--cached', '--quiet'], output_dir):
+            print("Nothing new to commit.")
+        else:
+            print("Committing...")
+            if not run_git(['commit', '-m', f'Deploy to GitHub Pages: {diff.summary()}'],
+                           output_dir):
+                print("\nCommit failed. Check your git user configuration.")
+                sys.exit(1)
+        save_manifest(manifest_path, new_manifest)
+
+    if not _has_unpushed_commits(output_dir):
+        print("No changes to deploy.")
+        return False
+
+    print("Pushing to gh-pages branch...")
+    if not run_git(['push', 'origin', 'gh-pages'], output_dir):
+        print("\nPush failed. Check your git credentials and try again.")
+        sys.exit(1)
+
+    _print_pages_url(remote_url)
+    return True
+
+
+def _git_output(args: list[str], cwd: Path) -> str | None:
+    """Run a git command and return its stripped stdout, or None on failure."""
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _has_unpushed_commits(output_dir: Path) -> bool:
+    """True if the local gh-pages branch has commits origin/gh-pages lacks."""
+    if _git_output(['rev-parse', '--verify', '-q', 'gh-pages'], output_dir) is None:
+        return False
+    if _git_output(['rev-parse', '--verify', '-q', 'origin/gh-pages'], output_dir) is None:
+        return True
+    count = _git_output(['rev-list', '--count', 'origin/gh-pages..gh-pages'], output_dir)
+    return bool(count) and count != '0'
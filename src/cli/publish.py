@@ -0,0 +1,222 @@
+"""Publish command for uploading the built site to a static file host."""
+import json
+import shutil
+import sys
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from src.utils.headers import cache_control
+from src.utils.manifest import (
+    build_manifest, diff_manifests, guess_content_type, load_manifest, save_manifest
+)
+
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    boto3 = None
+    BOTO3_AVAILABLE = False
+
+REMOTE_MANIFEST = '.deploy-manifest.json'
+
+
+class DeployTarget(ABC):
+    """Interface for a host that stores the built site as individual files."""
+
+    name = 'target'
+
+    @abstractmethod
+    def read_manifest(self) -> dict[str, dict]:
+        """Return the manifest of the currently published files."""
+
+    @abstractmethod
+    def write_manifest(self, manifest: dict[str, dict]) -> None:
+        """Store the manifest of the published files."""
+
+    @abstractmethod
+    def upload(self, rel_path: str, local_path: Path) -> None:
+        """Upload a single file. Must be safe to call from several threads."""
+
+    @abstractmethod
+    def delete(self, rel_path: str) -> None:
+        """Remove a single published file."""
+
+
+class LocalDirectoryTarget(DeployTarget):
+    """Publish into a directory, e.g. a web server root or a mounted bucket."""
+
+    name = 'local'
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def read_manifest(self) -> dict[str, dict]:
+        return load_manifest(self.path / REMOTE_MANIFEST)
+
+    def write_manifest(self, manifest: dict[str, dict]) -> None:
+        save_manifest(self.path / REMOTE_MANIFEST, manifest)
+
+    def upload(self, rel_path: str, local_path: Path) -> None:
+        dest = self.path / rel_path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + '.part')
+        shutil.copyfile(local_path, tmp)
+        tmp.replace(dest)
+
+    def delete(self, rel_path: str) -> None:
+        (self.path / rel_path).unlink(missing_ok=True)
+
+
+class S3Target(DeployTarget):
+    """Publish to an S3-compatible bucket (AWS, MinIO, R2, ...)."""
+
+    name = 's3'
+
+    def __init__(self, bucket: str, prefix: str = '', endpoint_url: str | None = None,
+                 region: str | None = None):
+        if not BOTO3_AVAILABLE:
+            raise RuntimeError("The s3 target requires 'boto3'. Install it with: pip install boto3")
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+
+    def _key(self, rel_path: str) -> str:
+        return f"{self.prefix}/{rel_path}" if self.prefix else rel_path
+
+    def read_manifest(self) -> dict[str, dict]:
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._key(REMOTE_MANIFEST))
+        except self.client.exceptions.NoSuchKey:
+            return {}
+        return json.loads(obj['Body'].read())
+
+    def write_manifest(self, manifest: dict[str, dict]) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(REMOTE_MANIFEST),
+            Body=json.dumps(manifest, sort_keys=True).encode('utf-8'),
+            ContentType='application/json'
+        )
+
+    def upload(self, rel_path: str, local_path: Path) -> None:
+        self.client.upload_file(
+            str(local_path), self.bucket, self._key(rel_path),
+            ExtraArgs={
+                'ContentType': guess_content_type(rel_path),
+                'CacheControl': cache_control(rel_path),
+            }
+        )
+
+    def delete(self, rel_path: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(rel_path))
+
+
+def create_target(target_config: dict) -> DeployTarget:
+    """Create a deploy target from the `deploy_target` config section."""
+    kind = target_config.get('type', 'local')
+    if kind == 'local':
+        return LocalDirectoryTarget(Path(target_config['path']))
+    if kind == 's3':
+        return S3Target(
+            bucket=target_config['bucket'],
+            prefix=target_config.get('prefix', ''),
+            endpoint_url=target_config.get('endpoint_url'),
+            region=target_config.get('region')
+        )
+    raise ValueError(f"Unknown deploy target type: {kind}")
+
+
+def _with_retries(fn, retries: int, backoff: float):
+    """Call fn, retrying with exponential backoff on any exception."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+
+
+def upload_site(
+    output_dir: Path,
+    target: DeployTarget,
+    workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5
+) -> dict:
+    """Upload changed files to a target using a bounded pool of workers.
+
+    Files whose content hash matches the remote manifest are skipped.
+    The remote manifest is only updated for files that were uploaded or
+    deleted successfully, so a partial failure is retried next time.
+    """
+    local_manifest = build_manifest(output_dir)
+    remote_manifest = target.read_manifest()
+    diff = diff_manifests(remote_manifest, local_manifest)
+
+    published = dict(remote_manifest)
+    counts = {'upload': 0, 'delete': 0}
+    failures = {}
+
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for rel_path in diff.added + diff.modified:
+            local_path = output_dir / rel_path
+            job = pool.submit(
+                _with_retries, lambda r=rel_path, p=local_path: target.upload(r, p),
+                retries, backoff
+            )
+            jobs[job] = ('upload', rel_path)
+        for rel_path in diff.deleted:
+            job = pool.submit(
+                _with_retries, lambda r=rel_path: target.delete(r), retries, backoff
+            )
+            jobs[job] = ('delete', rel_path)
+
+        for job in as_completed(jobs):
+            action, rel_path = jobs[job]
+            try:
+                job.result()
+            except Exception as e:
+                failures[rel_path] = str(e)
+                continue
+            counts[action] += 1
+            if action == 'upload':
+                published[rel_path] = local_manifest[rel_path]
+            else:
+                published.pop(rel_path, None)
+
+    if jobs:
+        target.write_manifest(dict(sorted(published.items())))
+
+    return {
+        'uploaded': counts['upload'],
+        'deleted': counts['delete'],
+        'skipped': len(local_manifest) - len(diff.added) - len(diff.modified),
+        'bytes': diff.bytes_changed,
+        'failures': failures,
+    }
+
+
+def publish_site(output_dir: Path, build_fn, target_config: dict) -> None:
+    """Build the site and upload it to the configured deploy target."""
+    target = create_target(target_config)
+    print("Building site...")
+    build_fn()
+
+    print(f"Publishing to {target.name} target...")
+    result = upload_site(
+        output_dir,
+        target,
+        workers=target_config.get('workers', 8),
+        retries=target_config.get('retries', 3)
+    )
+
+    print(f"  {result['uploaded']} uploaded, {result['deleted']} deleted, "
+          f"{result['skipped']} unchanged ({result['bytes']} bytes)")
+    if result['failures']:
+        for rel_path, error in sorted(result['failures'].items()):
+            print(f"  Failed: {rel_path}: {error}")
+        sys.exit(1)
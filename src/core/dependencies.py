@@ -0,0 +1,134 @@
+"""Track which templates and config keys each output page depends on."""
+import hashlib
+import json
+from pathlib import Path
+
+from jinja2 import Environment, meta
+
+
+def _hash_value(value) -> str:
+    """Stable hash of a config value."""
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class DependencyTracker:
+    """Dependency graph from output pages to templates and config keys.
+
+    Template dependencies (extends, include, import) and the variables a
+    template reads are found by parsing the template source once, so
+    recording a render costs a dictionary lookup.
+    """
+
+    def __init__(self, env: Environment, config: dict):
+        self.env = env
+        self.config = config
+        self.outputs: dict[str, dict] = {}
+        self._template_cache: dict[str, tuple[frozenset, frozenset]] = {}
+
+    def template_closure(self, name: str) -> tuple[frozenset, frozenset]:
+        """Return (templates, variables) used by a template and everything it pulls in."""
+        if name in self._template_cache:
+            return self._template_cache[name]
+
+        templates = {name}
+        variables = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            source = self.env.loader.get_source(self.env, current)[0]
+            ast = self.env.parse(source)
+            variables.update(meta.find_undeclared_variables(ast))
+            for ref in meta.find_referenced_templates(ast):
+                if ref is not None and ref not in templates:
+                    templates.add(ref)
+                    pending.append(ref)
+
+        result = (frozenset(templates), frozenset(variables))
+        self._template_cache[name] = result
+        return result
+
+    def record(self, output: str, templates=(), config_keys=()) -> None:
+        """Record dependencies for an output path (relative to the output dir)."""
+        entry = self.outputs.setdefault(output, {'templates': set(), 'config': set()})
+        entry['templates'].update(templates)
+        entry['config'].update(config_keys)
+
+    def record_render(self, output: str, template_name: str, config_keys=()) -> None:
+        """Record a template render; config keys the template reads are added."""
+        templates, variables = self.template_closure(template_name)
+        used_config = {v for v in variables if v in self.config}
+        self.record(output, templates, used_config | set(config_keys))
+
+    def _template_hashes(self) -> dict[str, str]:
+        names = set()
+        for entry in self.outputs.values():
+            names.update(entry['templates'])
+        hashes = {}
+        for name in sorted(names):
+            source = self.env.loader.get_source(self.env, name)[0]
+            hashes[name] = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        return hashes
+
+    def _config_hashes(self) -> dict[str, str]:
+        keys = set()
+        for entry in self.outputs.values():
+            keys.update(entry['config'])
+        return {key: _hash_value(self.config.get(key)) for key in sorted(keys)}
+
+    def snapshot(self) -> dict:
+        """Serializable graph plus hashes of every template and config value used."""
+        return {
+            'outputs': {
+                output: {
+                    'templates': sorted(entry['templates']),
+                    'config': sorted(entry['config'])
+                }
+                for output, entry in sorted(self.outputs.items())
+            },
+            'templates': self._template_hashes(),
+            'config': self._config_hashes(),
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.snapshot(), indent=1), encoding='utf-8')
+
+    @staticmethod
+    def load(path: Path) -> dict:
+        """Load a saved snapshot, or an empty one if missing or unreadable."""
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+
+def invalidated_outputs(previous: dict, current: dict) -> set[str]:
+    """Outputs whose templates or config values changed between two snapshots.
+
+    Outputs that are new in `current` are included; outputs that only
+    exist in `previous` are not (they are no longer produced).
+    """
+    old_outputs = previous.get('outputs', {})
+    old_templates = previous.get('templates', {})
+    old_config = previous.get('config', {})
+
+    changed_templates = {
+        name for name, digest in current.get('templates', {}).items()
+        if old_templates.get(name) != digest
+    }
+    changed_config = {
+        key for key, digest in current.get('config', {}).items()
+        if old_config.get(key) != digest
+    }
+
+    stale = set()
+    for output, entry in current.get('outputs', {}).items():
+        old_entry = old_outputs.get(output)
+        if old_entry is None or old_entry != entry:
+            stale.add(output)
+        elif changed_templates.intersection(entry['templates']):
+            stale.add(output)
+        elif changed_config.intersection(entry['config']):
+            stale.add(output)
+    return stale
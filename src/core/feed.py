@@ -18,7 +18,7 @@ def generate_rss(posts: list[Post], config: dict) -> str:
     SubElement(channel, 'link').text = base_url
     SubElement(channel, 'description').text = site_description
     SubElement(channel, 'language').text = 'en-us'
-    SubElement(channel, 'lastBuildDate').text = _format_rfc822(datetime.now())
+    SubElement(channel, 'lastBuildDate').text = _last_build_date(posts)
 
     atom_link = SubElement(channel, 'atom:link')
     atom_link.set('href', f"{base_url}feed.xml")
@@ -31,7 +31,7 @@ def generate_rss(posts: list[Post], config: dict) -> str:
         SubElement(item, 'link').text = f"{base_url}{post.slug}.html"
         SubElement(item, 'guid').text = f"{base_url}{post.slug}.html"
         SubElement(item, 'pubDate').text = _format_rfc822_date(post.date)
-        SubElement(item, 'description').text = _get_excerpt(post.content)
+        SubElement(item, 'description').text = post.excerpt
 
     xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
     return xml_declaration + tostring(rss, encoding='unicode')
@@ -42,16 +42,15 @@ def _format_rfc822(dt: datetime) -> str:
     return dt.strftime('%a, %d %b %Y %H:%M:%S +0000')
 
 
+def _last_build_date(posts: list[Post]) -> str:
+    """Use the newest post date so unchanged content produces an identical feed."""
+    if not posts:
+        return _format_rfc822(datetime.now())
+    return _format_rfc822_date(max(post.date for post in posts))
+
+
 def _format_rfc822_date(d) -> str:
     """Format date as RFC 822 string."""
     dt = datetime.combine(d, datetime.min.time())
     return _format_rfc822(dt)
 
-
-def _get_excerpt(content: str, max_length: int = 200) -> str:
-    """Get excerpt from markdown content."""
-    text = content.replace('#', '').replace('*', '').replace('`', '')
-    text = ' '.join(text.split())
-    if len(text) > max_length:
-        return text[:max_length].rsplit(' ', 1)[0] + '...'
-    return text
@@ -0,0 +1,142 @@
+"""Frontmatter splitting and parsing with a fast path for flat schemas.
+
+Most posts use flat `key: value` frontmatter with simple scalars and
+`[a, b]` lists. Those are parsed directly; anything the fast parser is
+not certain to read exactly like YAML falls back to libyaml's
+CSafeLoader (or the pure-Python safe_load when libyaml is missing).
+"""
+import re
+from datetime import date
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n(.*)$', re.DOTALL)
+WHITESPACE = re.compile(r'\s*')
+KEY_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_-]*')
+INT_PATTERN = re.compile(r'(?:0|[1-9][0-9]*)')
+DATE_PATTERN = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+PLAIN_PATTERN = re.compile(r"[^\W\d_][\w .,()/+?!'-]*", re.UNICODE)
+
+BOOLS = {
+    'true': True, 'True': True, 'TRUE': True,
+    'false': False, 'False': False, 'FALSE': False,
+    'yes': True, 'Yes': True, 'YES': True,
+    'no': False, 'No': False, 'NO': False,
+    'on': True, 'On': True, 'ON': True,
+    'off': False, 'Off': False, 'OFF': False,
+}
+NULLS = {'', '~', 'null', 'Null', 'NULL'}
+
+
+class _Fallback(Exception):
+    """Raised when the fast parser cannot guarantee YAML-identical output."""
+
+
+def split_frontmatter(text: str) -> tuple[str, str]:
+    """Split text into (frontmatter source, content).
+
+    The canonical layout is found by scanning only as far as the closing
+    delimiter; unusual layouts use the original regex so results match.
+    """
+    if text.startswith('---\n') and len(text) > 4 and not text[4].isspace():
+        end = text.find('\n---', 4)
+        if end != -1:
+            line_end = end + 4
+            if text.startswith('\n', line_end):
+                ws_end = WHITESPACE.match(text, line_end).end()
+                content_start = text.rfind('\n', line_end, ws_end) + 1
+                return text[4:end], text[content_start:]
+
+    match = FRONTMATTER_PATTERN.match(text)
+    if not match:
+        raise ValueError("Invalid frontmatter format")
+    return match.group(1), match.group(2)
+
+
+def _parse_scalar(value: str, in_list: bool = False):
+    """Parse a scalar exactly as YAML's safe loader would, or raise _Fallback."""
+    if value in NULLS:
+        if in_list and value == '':
+            raise _Fallback
+        return None
+    if value in BOOLS:
+        return BOOLS[value]
+
+    first = value[0]
+    if first == "'":
+        if len(value) >= 2 and value.endswith("'") and "'" not in value[1:-1] \
+                and '\n' not in value:
+            return value[1:-1]
+        raise _Fallback
+    if first == '"':
+        if len(value) >= 2 and value.endswith('"') and not any(
+                c in value[1:-1] for c in '"\\'):
+            return value[1:-1]
+        raise _Fallback
+
+    if first.isdigit():
+        if INT_PATTERN.fullmatch(value):
+            return int(value)
+        match = DATE_PATTERN.fullmatch(value)
+        if match:
+            try:
+                return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            except ValueError:
+                raise _Fallback
+        raise _Fallback
+
+    if PLAIN_PATTERN.fullmatch(value) and not (in_list and ',' in value):
+        return value
+    raise _Fallback
+
+
+def _parse_flat(source: str) -> dict | None:
+    """Parse flat `key: value` frontmatter, raising _Fallback for anything else."""
+    result = {}
+    for line in source.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if line[0] in ' \t' or '\t' in line or '#' in line:
+            raise _Fallback
+
+        key, sep, value = line.partition(':')
+        if not sep or not KEY_PATTERN.fullmatch(key) or key in BOOLS or key in NULLS \
+                or (value and value[0] != ' '):
+            raise _Fallback
+        value = value.strip()
+
+        if value.startswith('['):
+            if not value.endswith(']'):
+                raise _Fallback
+            inner = value[1:-1].strip()
+            if not inner:
+                result[key] = []
+            else:
+                result[key] = [_parse_scalar(item.strip(), in_list=True)
+                               for item in inner.split(',')]
+        else:
+            if any(c in value for c in '[]{}'):
+                raise _Fallback
+            result[key] = _parse_scalar(value)
+
+    return result or None
+
+
+def parse_frontmatter(source: str):
+    """Parse frontmatter source, using the fast path when it is exact."""
+    try:
+        return _parse_flat(source)
+    except _Fallback:
+        return yaml.load(source, Loader=SafeLoader)
+
+
+def extract_frontmatter(text: str) -> tuple[dict, str]:
+    """Extract YAML frontmatter and content from markdown text."""
+    source, content = split_frontmatter(text)
+    return parse_frontmatter(source), content
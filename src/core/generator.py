@@ -1,15 +1,52 @@
 import json
-from collections import defaultdict
+import shutil
+from collections import Counter, defaultdict
+from functools import partial
 from pathlib import Path
 from typing import Callable
 
 import markdown
 from jinja2 import Environment, FileSystemLoader
 
+from src.core.dependencies import DependencyTracker
 from src.core.feed import generate_rss
+from src.core.highlight import create_highlighter, render_fingerprint
+from src.core.linkcheck import check_links
+from src.core.parser import estimate_reading_time
+from src.core.related import compute_related
+from src.core import shards
+from src.core.store import ContentStore
 from src.core.sitemap import generate_sitemap
 from src.models.post import Post
 from src.utils import file_handler
+from src.utils.headers import MAX_RULES as MAX_HEADER_RULES, header_rules, render_headers_file
+from src.utils.manifest import build_manifest, manifest_entry, save_manifest
+from src.utils.writer import OutputWriter
+
+PAGE_FILES = {'about.md'}
+MONTH_NAMES = [
+    '', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December'
+]
+
+
+def unique_slugs(entries: list[tuple[str, Post]]) -> tuple[list[Post], list[tuple[str, str, str]]]:
+    """Keep the first post (by content path) for each slug.
+
+    Nested content can give two files the same slug, and both would render
+    to the same output page. Returns the kept posts and (path, slug, path of
+    the kept post) for each dropped duplicate.
+    """
+    seen = {}
+    posts = []
+    duplicates = []
+    for rel_path, post in sorted(entries, key=lambda entry: entry[0]):
+        if post.slug in seen:
+            duplicates.append((rel_path, post.slug, seen[post.slug]))
+            continue
+        seen[post.slug] = rel_path
+        posts.append(post)
+    return posts, duplicates
 
 
 class Generator:
@@ -17,7 +54,8 @@ class Generator:
         self,
         config: dict,
         parse_post: Callable[[Path], Post],
-        file_ops: object = file_handler
+        file_ops: object = file_handler,
+        env: Environment | None = None
     ):
         self.config = config
         self.parse_post = parse_post
@@ -28,11 +66,30 @@ class Generator:
         self.static_dir = Path(config['static_dir'])
         self.templates_dir = Path(config['templates_dir'])
         self.posts_per_page = config.get('posts_per_page', 10)
-
-        self.env = Environment(
+        self.content_ignore = config.get('content_ignore')
+        self.content_index = config.get('content_index')
+        self.archive_by_month = config.get('archive_by_month', False)
+        self.related_posts = config.get('related_posts', 3)
+        self.reading_time_wpm = config.get('reading_time_wpm', 200)
+        self.cache_dir = Path(config.get('cache_dir', '.cache'))
+        self.write_workers = config.get('write_workers', 4)
+        self.write_fsync = config.get('write_fsync', False)
+        self.cache_headers = config.get('cache_headers', False)
+        self.link_check = config.get('link_check', False)
+        self.link_check_fail = config.get('link_check_fail', False)
+        self.writer = None
+
+        self.highlighter = create_highlighter(config)
+        self.highlight_code = self.highlighter is not None
+        if self.highlighter:
+            self.parse_post = partial(parse_post, highlighter=self.highlighter)
+
+        # A shared environment (see src/cli/batch.py) reuses compiled templates
+        self.env = env or Environment(
             loader=FileSystemLoader(self.templates_dir),
             autoescape=True
         )
+        self.dependencies = DependencyTracker(self.env, config)
 
     def _base_context(self) -> dict:
         """Return common template context."""
@@ -43,63 +100,255 @@ class Generator:
             'author': self.config.get('author', ''),
             'twitter_handle': self.config.get('twitter_handle', ''),
             'github_handle': self.config.get('github_handle', ''),
+            'highlight_code': self.highlight_code,
         }
 
+    def _render_page(
+        self,
+        template,
+        context: dict,
+        output_path: Path,
+        config_keys: list[str] = ()
+    ) -> None:
+        """Render a template to output_path and record what the page depends on."""
+        html = template.render(**context)
+        self.writer.write(output_path, html)
+        self.dependencies.record_render(
+            output_path.relative_to(self.output_dir).as_posix(),
+            template.name,
+            config_keys
+        )
+
+    def _output_writer(self) -> OutputWriter:
+        """Start the writer for a pipeline stage.
+
+        Use it as a context manager so its threads are shut down even when
+        rendering raises.
+        """
+        self.writer = OutputWriter(workers=self.write_workers, fsync=self.write_fsync)
+        return self.writer
+
     def build(self) -> None:
         """Main build pipeline."""
         self.file_ops.clean_directory(self.output_dir)
 
-        all_posts = self._load_posts()
-        posts = [p for p in all_posts if not p.draft]
+        entries = self._load_posts()
+        all_posts = [post for _, post in entries]
+        posts, duplicates = unique_slugs([(r, p) for r, p in entries if not p.draft])
+        for rel_path, slug, first in duplicates:
+            print(f"Error: {rel_path} reuses slug '{slug}' from {first}; skipped")
+        posts = sorted(posts, key=lambda p: p.date, reverse=True)
+        for post in posts:
+            post.reading_time = estimate_reading_time(post.word_count, self.reading_time_wpm)
+
+        related = compute_related(
+            posts, self.related_posts, self.cache_dir / 'related.json'
+        )
+        with self._output_writer():
+            self._render_posts(posts, related)
+            self._render_site_pages(posts)
+        manifest = self._write_output_manifest()
+        self.dependencies.save(self.cache_dir / 'dependencies.json')
+        if self.highlighter:
+            self.highlighter.save()
+
+        draft_count = sum(1 for p in all_posts if p.draft)
+        print(f"Built {len(posts)} posts to {self.output_dir}/")
+        if draft_count:
+            print(f"  ({draft_count} drafts skipped)")
+        if self.link_check:
+            self.check_links(manifest)
+
+    def build_shard(self, index: int, count: int) -> None:
+        """Render the post pages owned by shard index/count and write its fragment.
+
+        Posts of other shards are read without converting markdown so related
+        posts are ranked over the whole site, exactly as in a full build.
+        """
+        shard_dir = shards.shard_dir(self.cache_dir, index, count)
+        self.file_ops.clean_directory(shard_dir)
+        # Post pages go to the shard directory; merge copies them to output_dir
+        self.output_dir = shard_dir / shards.PAGES_DIR
+
+        rel_paths = {}
+        owned = set()
+        all_posts = []
+        entries = []
+        for content_file in self.file_ops.scan_markdown_files(self.content_dir, self.content_ignore):
+            if content_file.rel_path in PAGE_FILES:
+                continue
+            is_owned = shards.shard_of(content_file.rel_path, count) == index
+            try:
+                post = self.parse_post(content_file.path, render=is_owned)
+            except Exception as e:
+                if is_owned:
+                    print(f"Error parsing {content_file.path}: {e}")
+                continue
+            rel_paths[id(post)] = content_file.rel_path
+            if is_owned:
+                owned.add(id(post))
+            all_posts.append(post)
+            entries.append((content_file.rel_path, post))
+
+        # Every shard sees all posts, so all agree on which duplicate is dropped
+        posts, duplicates = unique_slugs([(r, p) for r, p in entries if not p.draft])
+        for rel_path, slug, first in duplicates:
+            if shards.shard_of(rel_path, count) == index:
+                print(f"Error: {rel_path} reuses slug '{slug}' from {first}; skipped")
         posts = sorted(posts, key=lambda p: p.date, reverse=True)
+        own_posts = [p for p in posts if id(p) in owned]
+        for post in own_posts:
+            post.reading_time = estimate_reading_time(post.word_count, self.reading_time_wpm)
+
+        related = compute_related(
+            posts, self.related_posts, shard_dir.parent / f"related-{index}-of-{count}.json"
+        )
+        with self._output_writer():
+            self._render_posts(own_posts, related)
+        if self.highlighter:
+            self.highlighter.save()
+
+        drafts = sum(1 for p in all_posts if p.draft and id(p) in owned)
+        entries = [shards.post_to_dict(p, rel_paths[id(p)]) for p in own_posts]
+        shards.write_fragment(shard_dir / shards.FRAGMENT_NAME, index, count, entries, drafts)
+        print(f"Shard {index}/{count}: built {len(own_posts)} posts to {self.output_dir}/")
+
+    def merge(self, count: int) -> None:
+        """Combine the output of all shards and render the global pages."""
+        fragments = shards.load_fragments(self.cache_dir, count)
+        # Validate every shard before touching output_dir
+        pages = [page for fragment in fragments
+                 for page in shards.shard_pages(self.cache_dir, fragment)]
+        self.file_ops.clean_directory(self.output_dir)
+
+        # Copy rather than move, so merge can be rerun from the same shards
+        for page in pages:
+            shutil.copy2(page, self.output_dir / page.name)
+        entries = [item for fragment in fragments for item in fragment['posts']]
+
+        # Same order as a full build: content order, then newest first
+        entries.sort(key=lambda item: item['rel_path'])
+        posts = [shards.post_from_dict(item) for item in entries]
+        posts.sort(key=lambda p: p.date, reverse=True)
+
+        slug_counts = Counter(p.slug for p in posts)
+        duplicates = sorted(slug for slug, n in slug_counts.items() if n > 1)
+        if duplicates:
+            print(f"Warning: duplicate slugs across shards: {', '.join(duplicates)}")
+
+        with self._output_writer():
+            self._render_site_pages(posts)
+        manifest = self._write_output_manifest()
+
+        draft_count = sum(f['drafts'] for f in fragments)
+        print(f"Merged {count} shards: {len(posts)} posts to {self.output_dir}/")
+        if draft_count:
+            print(f"  ({draft_count} drafts skipped)")
+        if self.link_check:
+            self.check_links(manifest)
 
-        self._render_posts(posts)
-        self._render_paginated_index(posts)
-        self._render_archive(posts)
-        all_tags = self._render_tag_pages(posts)
+    def check_links(
+        self,
+        manifest: dict | None = None,
+        full: bool = False,
+        fail: bool | None = None
+    ) -> dict:
+        """Check internal links in the output and write a JSON report.
+
+        Raises RuntimeError on broken links when link_check_fail (or fail) is set.
+        """
+        if manifest is None:
+            manifest = build_manifest(self.output_dir)
+        report = check_links(
+            self.output_dir,
+            manifest,
+            self.cache_dir / 'linkcheck-state.json',
+            base_url=self.config.get('base_url', '/'),
+            ignore=self.config.get('link_check_ignore'),
+            workers=self.config.get('link_check_workers'),
+            full=full
+        )
+        report_path = self.cache_dir / 'link-report.json'
+        report_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+        print(f"Links: {report['broken_count']} broken across {report['pages']} pages "
+              f"({report['scanned']} scanned), report in {report_path}")
+        for item in report['broken'][:10]:
+            print(f"  {item['page']}: {item['link']}")
+        if report['broken_count'] > 10:
+            print(f"  ... and {report['broken_count'] - 10} more")
+
+        if report['broken_count'] and (self.link_check_fail if fail is None else fail):
+            raise RuntimeError(f"{report['broken_count']} broken internal links")
+        return report
+
+    def _render_site_pages(self, posts: list[Post]) -> None:
+        """Render everything except individual post pages and copy assets."""
+        index_pages = self._render_paginated_index(posts)
+        archive_pages = self._render_archive(posts)
+        all_tags, tag_pages = self._render_tag_pages(posts)
         self._render_static_pages()
         self._generate_feed(posts)
-        self._generate_sitemap(posts, all_tags)
+        self._generate_sitemap(posts, all_tags, index_pages + archive_pages + tag_pages)
         self._generate_search_index(posts)
         self._copy_assets()
+        if self.highlighter:
+            self._generate_highlight_css()
 
-        draft_count = len(all_posts) - len(posts)
-        print(f"Built {len(posts)} posts to {self.output_dir}/")
-        if draft_count:
-            print(f"  ({draft_count} drafts skipped)")
+    def _load_posts(self) -> list[tuple[str, Post]]:
+        """Load and parse all markdown files (excluding pages like about.md).
 
-    def _load_posts(self) -> list[Post]:
-        """Load and parse all markdown files (excluding pages like about.md)."""
-        posts = []
-        md_files = self.file_ops.list_markdown_files(self.content_dir)
-        page_files = {'about.md'}
+        Returns (relative path, post) pairs in path order.
+        """
+        if self.content_index:
+            return self._load_posts_from_index()
 
-        for filepath in md_files:
-            if filepath.name in page_files:
+        entries = []
+        md_files = self.file_ops.scan_markdown_files(self.content_dir, self.content_ignore)
+
+        for content_file in md_files:
+            if content_file.rel_path in PAGE_FILES:
                 continue
             try:
-                post = self.parse_post(filepath)
-                posts.append(post)
+                post = self.parse_post(content_file.path)
+                entries.append((content_file.rel_path, post))
             except Exception as e:
-                print(f"Error parsing {filepath}: {e}")
-
-        return posts
-
-    def _render_posts(self, posts: list[Post]) -> None:
+                print(f"Error parsing {content_file.path}: {e}")
+
+        return entries
+
+    def _load_posts_from_index(self) -> list[tuple[str, Post]]:
+        """Sync the SQLite content index and load posts from it.
+
+        Only files whose content changed since the last sync are parsed.
+        """
+        store = ContentStore(Path(self.content_index), self.parse_post,
+                             render_fingerprint(self.highlighter))
+        try:
+            changed, removed = store.sync(self.content_dir, self.content_ignore)
+            if changed or removed:
+                print(f"Index: {len(changed)} changed, {len(removed)} removed")
+            return store.load_entries()
+        finally:
+            store.close()
+
+    def _render_posts(self, posts: list[Post], related: dict[str, list[Post]]) -> None:
         """Render individual post pages."""
         template = self.env.get_template('post.html')
 
         for post in posts:
             context = self._base_context()
             context['post'] = post
-            html = template.render(**context)
+            context['related_posts'] = related.get(post.slug, [])
             output_path = self.output_dir / f"{post.slug}.html"
-            self.file_ops.write_file(output_path, html)
+            self._render_page(template, context, output_path,
+                              ['related_posts', 'reading_time_wpm'])
 
-    def _render_paginated_index(self, posts: list[Post]) -> None:
-        """Render paginated index pages."""
+    def _render_paginated_index(self, posts: list[Post]) -> list[str]:
+        """Render paginated index pages, returning paths of pages after the first."""
         template = self.env.get_template('index.html')
         pages = self._paginate(posts, self.posts_per_page)
+        extra_pages = []
 
         for i, page_posts in enumerate(pages):
             page_num = i + 1
@@ -111,40 +360,86 @@ class Generator:
                 'has_previous': page_num > 1,
                 'has_next': page_num < len(pages)
             })
-            html = template.render(**context)
             if page_num == 1:
                 output_path = self.output_dir / 'index.html'
             else:
-                page_dir = self.output_dir / 'page'
-                page_dir.mkdir(exist_ok=True)
-                output_path = page_dir / f"{page_num}.html"
-            self.file_ops.write_file(output_path, html)
-
-    def _render_archive(self, posts: list[Post]) -> None:
-        """Render archive page grouped by year."""
-        template = self.env.get_template('archive.html')
-        grouped = defaultdict(list)
-
+                output_path = self.output_dir / 'page' / f"{page_num}.html"
+                extra_pages.append(f"page/{page_num}.html")
+            self._render_page(template, context, output_path,
+                              ['posts_per_page', 'reading_time_wpm'])
+        return extra_pages
+
+    def _render_archive(self, posts: list[Post]) -> list[str]:
+        """Render the archive year index plus one page per year (or month)."""
+        by_year = defaultdict(list)
         for post in posts:
-            grouped[post.date.year].append(post)
+            by_year[post.date.year].append(post)
+        years = sorted(by_year.keys(), reverse=True)
 
-        years = sorted(grouped.keys(), reverse=True)
+        template = self.env.get_template('archive.html')
         context = self._base_context()
-        context.update({'years': years, 'posts_by_year': grouped})
-        html = template.render(**context)
-        output_path = self.output_dir / 'archive.html'
-        self.file_ops.write_file(output_path, html)
+        context.update({
+            'years': years,
+            'year_counts': {year: len(by_year[year]) for year in years}
+        })
+        self._render_page(template, context, self.output_dir / 'archive.html')
+
+        pages = []
+        year_template = self.env.get_template('archive_year.html')
+        month_template = self.env.get_template('archive_month.html')
+        for year in years:
+            by_month = defaultdict(list)
+            for post in by_year[year]:
+                by_month[post.date.month].append(post)
+            months = sorted(by_month.keys(), reverse=True)
 
-    def _render_tag_pages(self, posts: list[Post]) -> list[str]:
-        """Render tag listing and individual tag pages."""
+            context = self._base_context()
+            context.update({
+                'year': year,
+                'months': months,
+                'posts_by_month': by_month,
+                'month_pages': self.archive_by_month,
+                'month_names': MONTH_NAMES
+            })
+            self._render_page(
+                year_template, context,
+                self.output_dir / 'archive' / f"{year}.html",
+                ['archive_by_month', 'reading_time_wpm']
+            )
+            pages.append(f"archive/{year}.html")
+
+            if not self.archive_by_month:
+                continue
+            for month in months:
+                context = self._base_context()
+                context.update({
+                    'year': year,
+                    'month': month,
+                    'month_name': MONTH_NAMES[month],
+                    'posts': by_month[month]
+                })
+                self._render_page(
+                    month_template, context,
+                    self.output_dir / 'archive' / str(year) / f"{month:02d}.html",
+                    ['reading_time_wpm']
+                )
+                pages.append(f"archive/{year}/{month:02d}.html")
+
+        return pages
+
+    def _render_tag_pages(self, posts: list[Post]) -> tuple[list[str], list[str]]:
+        """Render tag listing and individual tag pages.
+
+        Returns the tag names and the paths of any extra paginated tag pages.
+        """
         tag_posts = defaultdict(list)
         for post in posts:
             for tag in post.tags:
                 tag_posts[tag].append(post)
 
         self._render_tags_index(tag_posts)
-        self._render_individual_tags(tag_posts)
-        return list(tag_posts.keys())
+        tag_pages = self._render_individual_tags(tag_posts)
+        return list(tag_posts.keys()), tag_pages
 
     def _render_tags_index(self, tag_posts: dict) -> None:
         """Render main tags page with counts."""
@@ -154,22 +449,37 @@ class Generator:
 
         context = self._base_context()
         context.update({'tags': tags, 'tag_counts': tag_counts})
-        html = template.render(**context)
         output_path = self.output_dir / 'tags.html'
-        self.file_ops.write_file(output_path, html)
+        self._render_page(template, context, output_path)
 
-    def _render_individual_tags(self, tag_posts: dict) -> None:
-        """Render individual tag pages."""
+    def _render_individual_tags(self, tag_posts: dict) -> list[str]:
+        """Render paginated tag pages, returning paths of pages after the first."""
         template = self.env.get_template('tag.html')
         tag_dir = self.output_dir / 'tag'
-        tag_dir.mkdir(exist_ok=True)
+        extra_pages = []
 
         for tag, posts in tag_posts.items():
-            context = self._base_context()
-            context.update({'tag': tag, 'posts': posts})
-            html = template.render(**context)
-            output_path = tag_dir / f"{tag}.html"
-            self.file_ops.write_file(output_path, html)
+            pages = self._paginate(posts, self.posts_per_page)
+            for i, page_posts in enumerate(pages):
+                page_num = i + 1
+                context = self._base_context()
+                context.update({
+                    'tag': tag,
+                    'posts': page_posts,
+                    'current_page': page_num,
+                    'total_pages': len(pages),
+                    'has_previous': page_num > 1,
+                    'has_next': page_num < len(pages)
+                })
+                if page_num == 1:
+                    output_path = tag_dir / f"{tag}.html"
+                else:
+                    output_path = tag_dir / tag / 'page' / f"{page_num}.html"
+                    extra_pages.append(f"tag/{tag}/page/{page_num}.html")
+                self._render_page(template, context, output_path,
+                                  ['posts_per_page', 'reading_time_wpm'])
+
+        return extra_pages
 
     def _paginate(self, items: list, per_page: int) -> list[list]:
         """Split items into pages."""
@@ -196,36 +506,41 @@ class Generator:
         template = self.env.get_template('about.html')
         context = self._base_context()
         context['content'] = html_content
-        html = template.render(**context)
         output_path = self.output_dir / 'about.html'
-        self.file_ops.write_file(output_path, html)
+        self._render_page(template, context, output_path)
 
     def _render_404(self) -> None:
         """Render 404 error page."""
         template = self.env.get_template('404.html')
         context = self._base_context()
-        html = template.render(**context)
         output_path = self.output_dir / '404.html'
-        self.file_ops.write_file(output_path, html)
+        self._render_page(template, context, output_path)
 
     def _generate_feed(self, posts: list[Post]) -> None:
         """Generate RSS feed and styled RSS page."""
         rss_content = generate_rss(posts, self.config)
         output_path = self.output_dir / 'feed.xml'
-        self.file_ops.write_file(output_path, rss_content)
+        self.writer.write(output_path, rss_content)
+        self.dependencies.record(
+            'feed.xml', config_keys=['site_name', 'base_url', 'site_description']
+        )
 
         template = self.env.get_template('rss.html')
         context = self._base_context()
         context['posts'] = posts
-        html = template.render(**context)
-        rss_page_path = self.output_dir / 'rss.html'
-        self.file_ops.write_file(rss_page_path, html)
+        self._render_page(template, context, self.output_dir / 'rss.html')
 
-    def _generate_sitemap(self, posts: list[Post], tags: list[str]) -> None:
+    def _generate_sitemap(
+        self,
+        posts: list[Post],
+        tags: list[str],
+        extra_pages: list[str]
+    ) -> None:
         """Generate sitemap.xml."""
-        sitemap_content = generate_sitemap(posts, tags, self.config)
+        sitemap_content = generate_sitemap(posts, tags, self.config, extra_pages)
         output_path = self.output_dir / 'sitemap.xml'
-        self.file_ops.write_file(output_path, sitemap_content)
+        self.writer.write(output_path, sitemap_content)
+        self.dependencies.record('sitemap.xml', config_keys=['base_url'])
 
     def _generate_search_index(self, posts: list[Post]) -> None:
         """Generate search index JSON for client-side search."""
@@ -236,10 +551,33 @@ class Generator:
                 'slug': post.slug,
                 'date': str(post.date),
                 'tags': post.tags,
-                'excerpt': post.content[:200].replace('\n', ' ')
+                'excerpt': post.excerpt
             })
         output_path = self.output_dir / 'search.json'
-        self.file_ops.write_file(output_path, json.dumps(index))
+        self.writer.write(output_path, json.dumps(index))
+        self.dependencies.record('search.json')
+
+    def _generate_highlight_css(self) -> None:
+        """Write the stylesheet for build-time highlighted code."""
+        output_path = self.output_dir / 'css' / 'highlight.css'
+        self.writer.write(output_path, self.highlighter.stylesheet())
+        self.dependencies.record('css/highlight.css', config_keys=['highlight_style'])
+
+    def _write_output_manifest(self) -> dict[str, dict]:
+        """Record hash, size and type of every output, plus host headers if enabled."""
+        manifest = build_manifest(self.output_dir)
+        if self.cache_headers:
+            rules = header_rules(manifest)
+            if len(rules) > MAX_HEADER_RULES:
+                print(f"Warning: _headers has {len(rules)} rules; "
+                      f"Cloudflare Pages only applies the first {MAX_HEADER_RULES}")
+            headers_path = self.output_dir / '_headers'
+            headers_path.write_text(render_headers_file(rules), encoding='utf-8')
+            # The rules cover the other outputs; the file itself is an output too
+            manifest['_headers'] = manifest_entry(headers_path, '_headers')
+            manifest = dict(sorted(manifest.items()))
+        save_manifest(self.cache_dir / 'output-manifest.json', manifest)
+        return manifest
 
     def _copy_assets(self) -> None:
         """Copy static assets and images to output directory."""
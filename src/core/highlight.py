@@ -0,0 +1,122 @@
+"""Build-time syntax highlighting for fenced code blocks.
+
+Highlighted HTML is cached by a hash of the language and code, so only new
+or edited snippets are passed through Pygments on later builds. Snippets used
+by a build are always kept; others (edited or deleted code, or posts a
+content index did not reparse) are evicted least recently used first once
+the cache holds more than max_entries. Tokens are marked with CSS classes
+only; colors come from the generated stylesheet.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+try:
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    PYGMENTS_AVAILABLE = True
+except ImportError:
+    PYGMENTS_AVAILABLE = False
+
+CODE_BLOCK_PATTERN = re.compile(
+    r'<pre><code class="language-([\w+#.-]+)">(.*?)</code></pre>', re.DOTALL
+)
+CSS_CLASS = 'highlight'
+
+
+def create_highlighter(config: dict) -> 'CodeHighlighter | None':
+    """Return the highlighter a site's config asks for, or None."""
+    if not config.get('highlight_code', False):
+        return None
+    if not PYGMENTS_AVAILABLE:
+        print("Warning: highlight_code requires Pygments; using client-side highlighting")
+        return None
+    return CodeHighlighter(
+        Path(config.get('cache_dir', '.cache')) / 'highlight.json',
+        config.get('highlight_style', 'monokai')
+    )
+
+
+def render_fingerprint(highlighter: 'CodeHighlighter | None') -> str:
+    """Identify the settings that shape rendered HTML, for caches of it."""
+    return f"pygments:{highlighter.style}" if highlighter else 'plain'
+
+
+class CodeHighlighter:
+    """Highlight `<pre><code class="language-x">` blocks produced by fenced_code."""
+
+    def __init__(self, cache_path: Path | None = None, style: str = 'monokai',
+                 max_entries: int = 4096):
+        self.cache_path = cache_path
+        self.style = style
+        self.max_entries = max_entries
+        self._formatter = HtmlFormatter(nowrap=True)
+        # Oldest first; keys looked up this run, in order of use
+        self._cache: dict[str, str] = {}
+        self._used: dict[str, None] = {}
+        self._dirty = False
+        if cache_path and cache_path.exists():
+            try:
+                self._cache = json.loads(cache_path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+
+    def highlight_block(self, code: str, language: str) -> str | None:
+        """Return highlighted HTML for code, or None for unknown languages."""
+        key = hashlib.sha1(f"{language}\0{code}".encode('utf-8')).hexdigest()
+        if key in self._cache:
+            self._used[key] = None
+            return self._cache[key]
+
+        try:
+            lexer = get_lexer_by_name(language)
+        except ClassNotFound:
+            return None
+        result = highlight(code, lexer, self._formatter)
+        self._cache[key] = result
+        self._used[key] = None
+        self._dirty = True
+        return result
+
+    def highlight_html(self, html_content: str) -> str:
+        """Replace every fenced code block with a known language by its highlighted form."""
+        def replace(match):
+            language, code = match.group(1), match.group(2)
+            highlighted = self.highlight_block(html.unescape(code), language.lower())
+            if highlighted is None:
+                return match.group(0)
+            return (f'<pre class="{CSS_CLASS}"><code class="language-{language}">'
+                    f'{highlighted}</code></pre>')
+
+        return CODE_BLOCK_PATTERN.sub(replace, html_content)
+
+    def stylesheet(self) -> str:
+        """CSS for the token classes in the configured Pygments style."""
+        return HtmlFormatter(style=self.style).get_style_defs(f'.{CSS_CLASS}')
+
+    def save(self) -> None:
+        """Write the cache atomically if it gained or evicted any snippet.
+
+        Snippets used this run move to the end as most recently used; older
+        ones are dropped from the front to stay within max_entries.
+        """
+        if not self.cache_path:
+            return
+        unused = [key for key in self._cache if key not in self._used]
+        room = max(0, self.max_entries - len(self._used))
+        keep = unused[len(unused) - room:] if room else []
+        if not self._dirty and len(keep) == len(unused):
+            return
+        self._cache = {key: self._cache[key] for key in keep + list(self._used)}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, prefix='.highlight-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_name, self.cache_path)
+        self._dirty = False
@@ -0,0 +1,135 @@
+"""Internal link and asset checker for the built site.
+
+Every internal `href`/`src` in the generated HTML is resolved to an output
+path and looked up in the output manifest. Extracted links are kept per page
+in a state file, so only pages whose hash changed since the last check are
+parsed again (in worker processes); all stored links are still validated
+against the current manifest, so deleting a page or image flags the
+unchanged pages that point to it.
+"""
+import json
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+LINK_ATTRS = {'href', 'src'}
+# Below this many changed pages, parsing in-process beats starting a pool
+MIN_PARALLEL_PAGES = 64
+
+
+class _LinkExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name in LINK_ATTRS and value:
+                self.links.append(value)
+
+
+def extract_links(path: Path) -> list[str]:
+    """Return every href/src value in an HTML file."""
+    parser = _LinkExtractor()
+    parser.feed(path.read_text(encoding='utf-8'))
+    parser.close()
+    return parser.links
+
+
+def _extract_chunk(output_dir: str, pages: list[str]) -> dict[str, list[str]]:
+    return {page: extract_links(Path(output_dir) / page) for page in pages}
+
+
+def resolve_link(link: str, page: str, base_url: str = '/') -> str | None:
+    """Map a link on page to an output path, or None if it is not internal."""
+    if base_url.startswith(('http://', 'https://')) and link.startswith(base_url):
+        link = '/' + link[len(base_url):]
+
+    parts = urlsplit(link)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None  # external, mailto:, data:, or a same-page #fragment
+
+    path = unquote(parts.path)
+    if not path.startswith('/'):
+        path = '/' + posixpath.join(posixpath.dirname(page), path)
+    target = posixpath.normpath(path).lstrip('/')
+    if path.endswith('/') or not target:
+        target = posixpath.join(target, 'index.html')
+    return target
+
+
+def _pages_to_scan(manifest: dict, previous: dict, full: bool) -> list[str]:
+    pages = []
+    for rel_path, entry in manifest.items():
+        if not entry['type'].startswith('text/html'):
+            continue
+        known = previous.get(rel_path)
+        if full or not known or known['hash'] != entry['hash']:
+            pages.append(rel_path)
+    return pages
+
+
+def check_links(
+    output_dir: Path,
+    manifest: dict[str, dict],
+    state_path: Path,
+    base_url: str = '/',
+    ignore: list[str] | None = None,
+    workers: int | None = None,
+    full: bool = False
+) -> dict:
+    """Check internal links of all HTML pages, reparsing only changed ones.
+
+    Returns a report with the number of pages scanned and every broken link.
+    """
+    try:
+        previous = json.loads(state_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        previous = {}
+
+    to_scan = _pages_to_scan(manifest, previous, full)
+    extracted = {}
+    if len(to_scan) < MIN_PARALLEL_PAGES:
+        extracted = _extract_chunk(str(output_dir), to_scan)
+    else:
+        workers = workers or os.cpu_count() or 1
+        size = max(1, len(to_scan) // (workers * 4))
+        chunks = [to_scan[i:i + size] for i in range(0, len(to_scan), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_extract_chunk, [str(output_dir)] * len(chunks), chunks):
+                extracted.update(result)
+
+    state = {}
+    broken = []
+    ignore = ignore or []
+    for rel_path, entry in manifest.items():
+        if not entry['type'].startswith('text/html'):
+            continue
+        if rel_path in extracted:
+            links = []
+            for link in extracted[rel_path]:
+                target = resolve_link(link, rel_path, base_url)
+                if target is not None:
+                    links.append([link, target])
+        else:
+            links = previous[rel_path]['links']
+        state[rel_path] = {'hash': entry['hash'], 'links': links}
+
+        for link, target in links:
+            if target in manifest or any(fnmatch('/' + target, p) for p in ignore):
+                continue
+            broken.append({'page': rel_path, 'link': link, 'target': target})
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state), encoding='utf-8')
+
+    return {
+        'pages': len(state),
+        'scanned': len(to_scan),
+        'broken_count': len(broken),
+        'broken': broken,
+    }
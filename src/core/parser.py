@@ -1,11 +1,13 @@
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
 
 import bleach
 import markdown
-import yaml
 
+from src.core.frontmatter import extract_frontmatter
+from src.core.text import analyze_html
 from src.models.post import Post
 
 SLUG_PATTERN = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
@@ -15,8 +17,13 @@ ALLOWED_TAGS = [
     'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
     'ul', 'ol', 'li', 'a', 'strong', 'em', 'code', 'pre',
     'blockquote', 'img', 'br', 'hr', 'table', 'thead',
-    'tbody', 'tr', 'th', 'td'
+    'tbody', 'tr', 'th', 'td', 'span'
 ]
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables']
+
+_converters = threading.local()
+
+
 def filter_url(tag: str, name: str, value: str) -> bool:
     """Only allow safe URL protocols."""
     if name in ('href', 'src'):
@@ -31,7 +38,8 @@ ALLOWED_ATTRS = {
     'a': filter_url,
     'img': filter_url,
     'code': ['class'],
-    'pre': ['class']
+    'pre': ['class'],
+    'span': ['class']
 }
 
 
@@ -42,11 +50,9 @@ def validate_slug(slug: str) -> str:
     return slug
 
 
-def estimate_reading_time(content: str, wpm: int = 200) -> int:
+def estimate_reading_time(words: int, wpm: int = 200) -> int:
     """Estimate reading time in minutes based on word count."""
-    words = len(content.split())
-    minutes = max(1, round(words / wpm))
-    return minutes
+    return max(1, round(words / wpm))
 
 
 def normalize_tags(tags: list) -> list[str]:
@@ -56,27 +62,28 @@ def normalize_tags(tags: list) -> list[str]:
     return [str(tag).lower().strip() for tag in tags if tag]
 
 
-def extract_frontmatter(text: str) -> tuple[dict, str]:
-    """Extract YAML frontmatter and content from markdown text."""
-    pattern = r'^---\s*\n(.*?)\n---\s*\n(.*)$'
-    match = re.match(pattern, text, re.DOTALL)
+def _markdown() -> markdown.Markdown:
+    """Per-thread Markdown instance, so extensions are set up once rather than per post."""
+    md = getattr(_converters, 'md', None)
+    if md is None:
+        md = _converters.md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return md
 
-    if not match:
-        raise ValueError("Invalid frontmatter format")
 
-    frontmatter = yaml.safe_load(match.group(1))
-    content = match.group(2)
-    return frontmatter, content
-
-
-def convert_markdown(content: str) -> str:
-    """Convert markdown content to sanitized HTML."""
-    html = markdown.markdown(content, extensions=['fenced_code', 'tables'])
+def convert_markdown(content: str, highlighter=None) -> str:
+    """Convert markdown content to sanitized HTML, optionally highlighting code blocks."""
+    html = _markdown().reset().convert(content)
+    if highlighter:
+        html = highlighter.highlight_html(html)
     return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS)
 
 
-def parse_post(filepath: Path) -> Post:
-    """Parse a markdown file into a Post object."""
+def parse_post(filepath: Path, render: bool = True, highlighter=None) -> Post:
+    """Parse a markdown file into a Post object.
+
+    With render=False the markdown is not converted; the post only carries
+    frontmatter and raw content, which is enough for related-post ranking.
+    """
     text = filepath.read_text(encoding='utf-8')
     frontmatter, content = extract_frontmatter(text)
 
@@ -90,11 +97,11 @@ def parse_post(filepath: Path) -> Post:
 
     raw_slug = frontmatter.get('slug', filepath.stem)
     slug = validate_slug(raw_slug)
-    html_content = convert_markdown(content)
+    html_content = convert_markdown(content, highlighter) if render else ''
 
     tags = normalize_tags(frontmatter.get('tags', []))
     draft = not frontmatter.get('publish', True)
-    reading_time = estimate_reading_time(content)
+    stats = analyze_html(html_content)
 
     return Post(
         title=title,
@@ -104,5 +111,8 @@ def parse_post(filepath: Path) -> Post:
         html_content=html_content,
         tags=tags,
         draft=draft,
-        reading_time=reading_time
+        reading_time=estimate_reading_time(stats['word_count']),
+        word_count=stats['word_count'],
+        excerpt=stats['excerpt'],
+        description=stats['description']
     )
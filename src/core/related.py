@@ -0,0 +1,242 @@
+"""Related-posts stage: tag index candidates ranked by TF-IDF similarity."""
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from src.models.post import Post
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+CACHE_VERSION = 2
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9]{2,}')
+MAX_TERMS = 32
+MAX_CANDIDATES = 200
+TAG_WEIGHT = 0.5
+PAD_ID = 2 ** 62
+REFRESH_RATIO = 0.1
+
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can',
+    'had', 'her', 'was', 'one', 'our', 'out', 'has', 'his', 'how', 'its',
+    'may', 'new', 'now', 'see', 'two', 'who', 'did', 'get', 'let', 'use',
+    'that', 'this', 'with', 'from', 'have', 'they', 'will', 'your', 'what',
+    'when', 'which', 'there', 'their', 'about', 'would', 'these', 'other',
+    'into', 'than', 'then', 'them', 'some', 'could', 'also', 'just', 'more',
+    'like', 'only', 'over', 'such', 'very', 'were', 'been', 'here', 'http',
+    'https', 'www', 'com'
+}
+
+
+def _tokenize(text: str) -> Counter:
+    """Count content words in a post body."""
+    return Counter(t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS)
+
+
+def _post_key(post: Post) -> str:
+    """Hash of everything a post contributes: slug, tags and body."""
+    digest = hashlib.sha1(post.slug.encode('utf-8'))
+    digest.update(b'\0' + ','.join(post.tags).encode('utf-8'))
+    digest.update(b'\0' + post.content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _term_vector(counts: Counter, df: dict, n: int) -> tuple[list[str], list[float]]:
+    """Strongest TF-IDF terms of a post, strongest first, with unit-norm weights."""
+    weighted = heapq.nlargest(
+        MAX_TERMS,
+        ((tf * (math.log((n + 1) / (df.get(term, 0) + 1)) + 1), term)
+         for term, tf in counts.items())
+    )
+    norm = math.sqrt(sum(w * w for w, _ in weighted)) or 1.0
+    return [term for _, term in weighted], [w / norm for w, _ in weighted]
+
+
+def _load_cache(cache_path: Path | None, k: int) -> dict:
+    if cache_path and cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text(encoding='utf-8'))
+            if cache.get('version') == CACHE_VERSION and cache.get('k') == k:
+                return cache
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def _candidates(i: int, posts: list[Post], tag_index: dict, term_index: dict,
+                term_ids: list[int], k: int) -> Counter:
+    """Collect candidate posts for post i, counting shared tags.
+
+    term_ids must be ordered strongest first, so the fallback for posts
+    with few tag neighbours follows their most distinctive terms.
+    """
+    shared = Counter()
+    for tag in posts[i].tags:
+        shared.update(j for j in tag_index[tag][:MAX_CANDIDATES] if j != i)
+
+    if len(shared) < k:
+        for term_id in term_ids:
+            for j in term_index[term_id][:MAX_CANDIDATES]:
+                if j != i and j not in shared:
+                    shared[j] = 0
+            if len(shared) >= MAX_CANDIDATES:
+                break
+    return shared
+
+
+def _rank_numpy(i, cand, shared, ids, weights, k):
+    """Score candidates with vectorized sparse dot products and pick the top k."""
+    own_ids = ids[i]
+    own_weights = weights[i]
+    cand_ids = ids[cand]
+    pos = np.minimum(np.searchsorted(own_ids, cand_ids), len(own_ids) - 1)
+    match = (own_ids[pos] == cand_ids) & (cand_ids != PAD_ID)
+    sims = (weights[cand] * own_weights[pos] * match).sum(axis=1)
+
+    scores = sims + TAG_WEIGHT * shared
+    # Highest score first, lowest post index on ties (same as _rank_python)
+    order = np.lexsort((cand, -scores))[:k]
+    return [int(cand[t]) for t in order]
+
+
+def _rank_python(i, cand, shared, ids, weights, k):
+    """Pure-Python fallback of _rank_numpy."""
+    own = dict(zip(ids[i], weights[i]))
+    scored = []
+    for j, tags in zip(cand, shared):
+        sim = sum(w * own.get(t, 0.0) for t, w in zip(ids[j], weights[j]))
+        scored.append((-(sim + TAG_WEIGHT * tags), j))
+    return [j for _, j in sorted(scored)[:k]]
+
+
+def compute_related(posts: list[Post], k: int = 3,
+                    cache_path: Path | None = None) -> dict[str, list[Post]]:
+    """Map each post slug to its k most related posts.
+
+    Candidates come from an inverted tag index (falling back to shared
+    top terms for untagged posts), so each post is only compared against
+    a bounded set instead of the whole list.
+
+    With a cache, term vectors and results are stored per post under a
+    hash of its content. A post is only re-tokenized when it changed, and
+    only re-ranked when it or one of its candidates changed. Document
+    frequencies are frozen between full refreshes, which happen when more
+    than REFRESH_RATIO of the posts changed or the post count drifted by
+    as much.
+    """
+    if k <= 0 or len(posts) < 2:
+        return {}
+
+    cache = _load_cache(cache_path, k)
+    cached_posts = cache.get('posts', {})
+    keys = [_post_key(post) for post in posts]
+    dirty = {
+        i for i, post in enumerate(posts)
+        if cached_posts.get(post.slug, {}).get('key') != keys[i]
+    }
+    n_at_refresh = cache.get('n', 0)
+    full_refresh = (
+        'df' not in cache
+        or len(dirty) > REFRESH_RATIO * len(posts)
+        or abs(len(posts) - n_at_refresh) > REFRESH_RATIO * n_at_refresh
+    )
+
+    if full_refresh:
+        counts = [_tokenize(post.content) for post in posts]
+        df = Counter()
+        for c in counts:
+            df.update(c.keys())
+        n = len(posts)
+        vectors = [_term_vector(c, df, n) for c in counts]
+        dirty = set(range(len(posts)))
+    else:
+        df, n = cache['df'], n_at_refresh
+        vectors = []
+        for i, post in enumerate(posts):
+            if i in dirty:
+                vectors.append(_term_vector(_tokenize(post.content), df, n))
+            else:
+                entry = cached_posts[post.slug]
+                vectors.append((entry['terms'], entry['weights']))
+
+    vocab = {term: i for i, term in enumerate(sorted({t for terms, _ in vectors for t in terms}))}
+    strongest = [[vocab[t] for t in terms] for terms, _ in vectors]
+    term_ids, term_weights = [], []
+    for ids_by_weight, (_, w) in zip(strongest, vectors):
+        pairs = sorted(zip(ids_by_weight, w))
+        term_ids.append([term_id for term_id, _ in pairs])
+        term_weights.append([weight for _, weight in pairs])
+
+    tag_index = defaultdict(list)
+    term_index = defaultdict(list)
+    for i, post in enumerate(posts):
+        for tag in post.tags:
+            tag_index[tag].append(i)
+        for term_id in strongest[i][:8]:
+            term_index[term_id].append(i)
+
+    if NUMPY_AVAILABLE:
+        width = max((len(t) for t in term_ids), default=0) or 1
+        ids = np.full((len(posts), width), PAD_ID, dtype=np.int64)
+        weights = np.zeros((len(posts), width), dtype=np.float64)
+        for i, (t, w) in enumerate(zip(term_ids, term_weights)):
+            ids[i, :len(t)] = t
+            weights[i, :len(w)] = w
+        rank = _rank_numpy
+    else:
+        ids, weights = term_ids, term_weights
+        rank = _rank_python
+
+    by_slug = {post.slug: post for post in posts}
+    related_slugs = {}
+    for i, post in enumerate(posts):
+        candidates = _candidates(i, posts, tag_index, term_index, strongest[i], k)
+        previous = cached_posts.get(post.slug, {}).get('related')
+        if (i not in dirty and previous is not None
+                and not dirty.intersection(candidates)
+                and all(slug in by_slug for slug in previous)):
+            related_slugs[post.slug] = previous
+            continue
+        if not candidates:
+            related_slugs[post.slug] = []
+            continue
+        tag_count = max(1, len(post.tags))
+        if NUMPY_AVAILABLE:
+            cand = np.fromiter(candidates.keys(), dtype=np.int64, count=len(candidates))
+            shared = np.fromiter(candidates.values(), dtype=np.float64,
+                                 count=len(candidates)) / tag_count
+        else:
+            cand = list(candidates.keys())
+            shared = [candidates[j] / tag_count for j in cand]
+        related_slugs[post.slug] = [posts[j].slug for j in rank(i, cand, shared, ids, weights, k)]
+
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({
+            'version': CACHE_VERSION,
+            'k': k,
+            'n': n,
+            'df': df,
+            'posts': {
+                post.slug: {
+                    'key': keys[i],
+                    'terms': vectors[i][0],
+                    'weights': vectors[i][1],
+                    'related': related_slugs[post.slug],
+                }
+                for i, post in enumerate(posts)
+            },
+        }), encoding='utf-8')
+
+    return {
+        slug: [by_slug[s] for s in related]
+        for slug, related in related_slugs.items()
+    }
@@ -0,0 +1,101 @@
+"""Deterministic post partitioning and metadata fragments for sharded builds.
+
+A shard renders the post pages for its share of content files into
+`<cache_dir>/shards/<i>-of-<N>/pages/` and writes a `fragment.json` with
+the metadata of those posts. `merge` combines all N fragments into the
+global pages (index, tags, archive, feed, sitemap, search index).
+"""
+import json
+import zlib
+from pathlib import Path
+
+from src.models.post import Post, date_from_iso, date_to_iso
+
+FRAGMENT_NAME = 'fragment.json'
+PAGES_DIR = 'pages'
+
+
+def parse_shard_spec(spec: str) -> tuple[int, int]:
+    """Parse 'i/N' into (i, N), with shards numbered from 1."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}': expected i/N, e.g. 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}': need 1 <= i <= N")
+    return index, count
+
+
+def shard_of(rel_path: str, count: int) -> int:
+    """Shard number (1..count) owning a content file; stable across machines."""
+    return zlib.crc32(rel_path.encode('utf-8')) % count + 1
+
+
+def shard_dir(cache_dir: Path, index: int, count: int) -> Path:
+    return cache_dir / 'shards' / f"{index}-of-{count}"
+
+
+def post_to_dict(post: Post, rel_path: str) -> dict:
+    """Metadata needed by the global pages; content and HTML are left out."""
+    return {
+        'rel_path': rel_path,
+        'title': post.title,
+        'date': date_to_iso(post.date),
+        'slug': post.slug,
+        'tags': post.tags,
+        'reading_time': post.reading_time,
+        'word_count': post.word_count,
+        'excerpt': post.excerpt,
+        'description': post.description,
+    }
+
+
+def post_from_dict(item: dict) -> Post:
+    return Post(
+        title=item['title'],
+        date=date_from_iso(item['date']),
+        slug=item['slug'],
+        content='',
+        html_content='',
+        tags=item['tags'],
+        reading_time=item['reading_time'],
+        word_count=item['word_count'],
+        excerpt=item['excerpt'],
+        description=item['description']
+    )
+
+
+def write_fragment(path: Path, index: int, count: int, entries: list[dict], drafts: int) -> None:
+    data = {'shard': index, 'count': count, 'drafts': drafts, 'posts': entries}
+    path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+def load_fragments(cache_dir: Path, count: int) -> list[dict]:
+    """Load the fragments of all shards, checking none is missing or stale."""
+    fragments = []
+    for index in range(1, count + 1):
+        path = shard_dir(cache_dir, index, count) / FRAGMENT_NAME
+        if not path.exists():
+            raise FileNotFoundError(f"Missing fragment for shard {index}/{count}: {path}")
+        fragment = json.loads(path.read_text(encoding='utf-8'))
+        if fragment.get('shard') != index or fragment.get('count') != count:
+            raise ValueError(f"Fragment {path} does not belong to shard {index}/{count}")
+        fragments.append(fragment)
+    return fragments
+
+
+def shard_pages(cache_dir: Path, fragment: dict) -> list[Path]:
+    """Return the rendered pages of a shard, checking they match its fragment."""
+    pages_dir = shard_dir(cache_dir, fragment['shard'], fragment['count']) / PAGES_DIR
+    pages = sorted(pages_dir.iterdir()) if pages_dir.exists() else []
+    expected = {f"{item['slug']}.html" for item in fragment['posts']}
+    found = {page.name for page in pages}
+    if found != expected or len(pages) != len(fragment['posts']):
+        missing, extra = sorted(expected - found), sorted(found - expected)
+        raise ValueError(
+            f"Shard {fragment['shard']}/{fragment['count']} has {len(pages)} pages for "
+            f"{len(fragment['posts'])} posts in its fragment "
+            f"(missing: {', '.join(missing) or 'none'}; unexpected: {', '.join(extra) or 'none'}); "
+            f"rebuild the shard"
+        )
+    return pages
@@ -3,7 +3,12 @@ from xml.etree.ElementTree import Element, SubElement, tostring
 from src.models.post import Post
 
 
-def generate_sitemap(posts: list[Post], tags: list[str], config: dict) -> str:
+def generate_sitemap(
+    posts: list[Post],
+    tags: list[str],
+    config: dict,
+    extra_pages: list[str] | None = None
+) -> str:
     """Generate sitemap.xml for search engines."""
     base_url = config.get('base_url', '/')
 
@@ -20,6 +25,9 @@ def generate_sitemap(posts: list[Post], tags: list[str], config: dict) -> str:
     for tag in tags:
         _add_url(urlset, base_url, f"tag/{tag}.html", '0.6', 'weekly')
 
+    for path in extra_pages or []:
+        _add_url(urlset, base_url, path, '0.5', 'weekly')
+
     xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
     return xml_declaration + tostring(urlset, encoding='unicode')
 
@@ -0,0 +1,340 @@
+"""Optional SQLite index of posts with FTS5 full-text search."""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Callable
+
+from src.models.post import Post, date_from_iso, date_to_iso
+from src.utils import file_handler
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    rel_path TEXT UNIQUE NOT NULL,
+    slug TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT,
+    tags TEXT NOT NULL,
+    draft INTEGER NOT NULL,
+    reading_time INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    excerpt TEXT NOT NULL,
+    description TEXT NOT NULL,
+    content TEXT NOT NULL,
+    html TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_slug ON posts(slug);
+CREATE INDEX IF NOT EXISTS posts_date ON posts(date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, tags, content)
+"""
+
+# Sort name -> (SQL expression, descending); rel_path ascending breaks ties
+SORT_COLUMNS = {
+    'date': ("coalesce(date, '')", True),
+    '-date': ("coalesce(date, '')", False),
+    'title': ('lower(title)', False),
+    '-title': ('lower(title)', True),
+}
+
+
+# Word characters as FTS5's unicode61 tokenizer sees them ('_' separates)
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def search_terms(text: str) -> list[str]:
+    """Case-folded, diacritic-free words, tokenized like the FTS index."""
+    folded = unicodedata.normalize('NFKD', text.casefold())
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return WORD_PATTERN.findall(folded)
+
+
+def title_matches(title: str, search: str) -> bool:
+    """True if every search term is a prefix of a word in the title.
+
+    This is what the FTS title query matches, so the SQLite store and the
+    in-memory admin index return the same posts for the same search.
+    """
+    words = search_terms(title)
+    return all(any(word.startswith(term) for word in words) for term in search_terms(search))
+
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ContentStore:
+    """Post metadata, file hashes and rendered HTML kept in SQLite.
+
+    sync() only reparses files whose mtime/size changed and whose hash
+    differs, so the generator and the admin share one index instead of
+    rescanning and reparsing content/ separately. `fingerprint` names the
+    render settings behind the stored HTML (see render_fingerprint); when
+    it differs from the one stored, every post is reparsed on next sync.
+    """
+
+    def __init__(self, path: Path, parse_post: Callable[[Path], Post], fingerprint: str = ''):
+        self.path = Path(path)
+        self.parse_post = parse_post
+        self.fingerprint = fingerprint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function('title_matches', 2, title_matches, deterministic=True)
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.execute(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self._check_fingerprint()
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        """Rebuild the index from scratch when the schema version changed."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        self._conn.executescript(
+            "DROP TABLE IF EXISTS posts; DROP TABLE IF EXISTS posts_fts;"
+        )
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _check_fingerprint(self) -> None:
+        """Drop every post if its HTML was rendered with other settings."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'fingerprint'"
+        ).fetchone()
+        if row and row['value'] == self.fingerprint:
+            return
+        self._conn.execute("DELETE FROM posts")
+        if self.fts:
+            self._conn.execute("DELETE FROM posts_fts")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+            (self.fingerprint,)
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _upsert(self, rel_path: str, post: Post, digest: str, mtime: float, size: int) -> None:
+        row = self._conn.execute(
+            "SELECT id FROM posts WHERE rel_path = ?", (rel_path,)
+        ).fetchone()
+        values = (
+            post.slug, post.title, date_to_iso(post.date), json.dumps(post.tags),
+            int(post.draft), post.reading_time, post.word_count, post.excerpt,
+            post.description, post.content, post.html_content, digest, mtime, size
+        )
+        if row:
+            post_id = row['id']
+            self._conn.execute(
+                """UPDATE posts SET slug=?, title=?, date=?, tags=?, draft=?,
+                   reading_time=?, word_count=?, excerpt=?, description=?,
+                   content=?, html=?, hash=?, mtime=?, size=?
+                   WHERE id=?""",
+                values + (post_id,)
+            )
+        else:
+            post_id = self._conn.execute(
+                """INSERT INTO posts (slug, title, date, tags, draft, reading_time,
+                   word_count, excerpt, description, content, html, hash, mtime,
+                   size, rel_path)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                values + (rel_path,)
+            ).lastrowid
+        if self.fts:
+            self._conn.execute("DELETE FROM posts_fts WHERE rowid = ?", (post_id,))
+            self._conn.execute(
+                "INSERT INTO posts_fts (rowid, title, tags, content) VALUES (?, ?, ?, ?)",
+                (post_id, post.title, ' '.join(post.tags), post.content)
+            )
+
+    def _delete(self, rel_path: str) -> None:
+        row = self._conn.execute(
+            "SELECT id FROM posts WHERE rel_path = ?", (rel_path,)
+        ).fetchone()
+        if not row:
+            return
+        self._conn.execute("DELETE FROM posts WHERE id = ?", (row['id'],))
+        if self.fts:
+            self._conn.execute("DELETE FROM posts_fts WHERE rowid = ?", (row['id'],))
+
+    def _refresh(self, content_file: file_handler.ContentFile, known: dict | None) -> bool:
+        """Update one file's row; return True if its content changed."""
+        if known and known['mtime'] == content_file.mtime and known['size'] == content_file.size:
+            return False
+        digest = _hash_file(content_file.path)
+        if known and known['hash'] == digest:
+            self._conn.execute(
+                "UPDATE posts SET mtime = ?, size = ? WHERE rel_path = ?",
+                (content_file.mtime, content_file.size, content_file.rel_path)
+            )
+            return False
+        try:
+            post = self.parse_post(content_file.path)
+        except Exception as e:
+            print(f"Error parsing {content_file.path}: {e}")
+            self._delete(content_file.rel_path)
+            return False
+        self._upsert(content_file.rel_path, post, digest, content_file.mtime, content_file.size)
+        return True
+
+    def sync(self, content_dir: Path, ignore: list[str] | None = None,
+             skip: set[str] = frozenset({'about.md'})) -> tuple[list[str], list[str]]:
+        """Bring the index in line with content_dir.
+
+        Returns (changed, removed) relative paths.
+        """
+        files = [
+            f for f in file_handler.scan_markdown_files(content_dir, ignore)
+            if f.rel_path not in skip
+        ]
+        with self._lock:
+            known = {
+                row['rel_path']: row for row in
+                self._conn.execute("SELECT rel_path, mtime, size, hash FROM posts")
+            }
+            changed = [f.rel_path for f in files if self._refresh(f, known.get(f.rel_path))]
+            present = {f.rel_path for f in files}
+            removed = sorted(set(known) - present)
+            for rel_path in removed:
+                self._delete(rel_path)
+            self._conn.commit()
+        return changed, removed
+
+    def update_file(self, content_dir: Path, path: Path) -> None:
+        """Reindex a single file after it was written (e.g. from the admin)."""
+        stat = path.stat()
+        rel_path = path.relative_to(content_dir).as_posix()
+        content_file = file_handler.ContentFile(path, rel_path, stat.st_mtime, stat.st_size)
+        with self._lock:
+            self._refresh(content_file, None)
+            self._conn.commit()
+
+    def remove_file(self, content_dir: Path, path: Path) -> None:
+        """Drop a deleted file from the index."""
+        with self._lock:
+            self._delete(path.relative_to(content_dir).as_posix())
+            self._conn.commit()
+
+    def _row_to_post(self, row) -> Post:
+        return Post(
+            title=row['title'],
+            date=date_from_iso(row['date']),
+            slug=row['slug'],
+            content=row['content'],
+            html_content=row['html'],
+            tags=json.loads(row['tags']),
+            draft=bool(row['draft']),
+            reading_time=row['reading_time'],
+            word_count=row['word_count'],
+            excerpt=row['excerpt'],
+            description=row['description']
+        )
+
+    def load_entries(self) -> list[tuple[str, Post]]:
+        """Return (rel_path, post) for every indexed post, in path order."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM posts ORDER BY rel_path").fetchall()
+        return [(row['rel_path'], self._row_to_post(row)) for row in rows]
+
+    def load_posts(self, rel_paths: list[str] | None = None) -> list[Post]:
+        """Return indexed posts, optionally only those at the given paths."""
+        with self._lock:
+            if rel_paths is None:
+                rows = self._conn.execute("SELECT * FROM posts ORDER BY rel_path").fetchall()
+            else:
+                rows = []
+                for rel_path in rel_paths:
+                    rows.extend(self._conn.execute(
+                        "SELECT * FROM posts WHERE rel_path = ?", (rel_path,)
+                    ))
+        return [self._row_to_post(row) for row in rows]
+
+    def get_by_slug(self, slug: str) -> dict | None:
+        """Return the row for a slug as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM posts WHERE slug = ? ORDER BY rel_path LIMIT 1", (slug,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def _row_to_dict(self, row) -> dict:
+        item = dict(row)
+        item['tags'] = json.loads(item['tags'])
+        item['draft'] = bool(item['draft'])
+        item['date'] = date_from_iso(item['date'])
+        return item
+
+    def query(
+        self,
+        search: str = '',
+        tag: str | None = None,
+        draft: bool | None = None,
+        sort: str = 'date',
+        limit: int | None = None,
+        after: tuple[str, str] | None = None
+    ) -> list[dict]:
+        """Search, filter and sort posts without reading any files.
+
+        `after` is a (sort value, rel_path) keyset cursor: only rows that
+        come after it in the requested order are returned.
+        """
+        column, descending = SORT_COLUMNS.get(sort, SORT_COLUMNS['date'])
+        sql = ("SELECT id, rel_path, slug, title, lower(title) AS title_key, date, tags, "
+               "draft, reading_time FROM posts")
+        where, params = [], []
+
+        if search_terms(search):
+            if self.fts:
+                where.append("id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)")
+                params.append(self._fts_query(search))
+            else:
+                where.append("title_matches(title, ?)")
+                params.append(search)
+        if tag:
+            where.append("EXISTS (SELECT 1 FROM json_each(posts.tags) WHERE value = ?)")
+            params.append(tag)
+        if draft is not None:
+            where.append("draft = ?")
+            params.append(int(draft))
+
+        if after:
+            op = '<' if descending else '>'
+            where.append(f"({column} {op} ? OR ({column} = ? AND rel_path > ?))")
+            params.extend([after[0], after[0], after[1]])
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column} {'DESC' if descending else 'ASC'}, rel_path ASC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _fts_query(search: str) -> str:
+        """Turn user input into an FTS5 prefix query on the title column."""
+        return ' '.join(f'title : "{term}"*' for term in search_terms(search))
@@ -0,0 +1,60 @@
+"""Plain-text analysis of rendered posts: word count, excerpt, description."""
+from html.parser import HTMLParser
+
+EXCERPT_LENGTH = 200
+DESCRIPTION_LENGTH = 155
+SKIP_TAGS = {'pre', 'script', 'style'}
+BLOCK_TAGS = {
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'blockquote', 'table', 'tr', 'td', 'th', 'hr'
+}
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text, skipping code blocks and separating blocks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_text(html: str) -> str:
+    """Return the visible prose of rendered HTML as whitespace-normalized text."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ' '.join(''.join(parser.parts).split())
+
+
+def truncate(text: str, max_length: int) -> str:
+    """Cut text at a word boundary, adding an ellipsis if shortened."""
+    if len(text) <= max_length:
+        return text
+    return text[:max_length].rsplit(' ', 1)[0] + '...'
+
+
+def analyze_html(html: str) -> dict:
+    """Extract text once and derive word count, excerpt and meta description."""
+    text = extract_text(html)
+    return {
+        'word_count': len(text.split()),
+        'excerpt': truncate(text, EXCERPT_LENGTH),
+        'description': truncate(text, DESCRIPTION_LENGTH),
+    }
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 
 
 @dataclass
@@ -12,3 +12,20 @@ class Post:
     tags: list[str] = field(default_factory=list)
     draft: bool = False
     reading_time: int = 1
+    word_count: int = 0
+    excerpt: str = ''
+    description: str = ''
+
+
+def date_to_iso(value: date | None) -> str | None:
+    """Serialize a post date (date or datetime) for storage; None stays None."""
+    return value.isoformat() if value is not None else None
+
+
+def date_from_iso(value: str | None) -> date | None:
+    """Inverse of date_to_iso: a datetime if a time was stored, else a date."""
+    if value is None:
+        return None
+    if 'T' in value:
+        return datetime.fromisoformat(value)
+    return date.fromisoformat(value)
@@ -1,6 +1,19 @@
+import os
 import shutil
+from dataclasses import dataclass
+from fnmatch import fnmatch
 from pathlib import Path
 
+DEFAULT_IGNORE = ['.*', '_*', '__pycache__', 'images']
+
+
+@dataclass(frozen=True)
+class ContentFile:
+    path: Path
+    rel_path: str
+    mtime: float
+    size: int
+
 
 def validate_path(path: Path, base: Path) -> bool:
     """Check if path is within the base directory (prevents traversal)."""
@@ -56,11 +69,53 @@ def read_file(path: Path) -> str:
     return path.read_text(encoding='utf-8')
 
 
-def list_markdown_files(path: Path) -> list[Path]:
-    """List all markdown files in a directory."""
+def _is_ignored(name: str, rel_path: str, patterns: list[str]) -> bool:
+    """Check a file or directory against ignore patterns (name or relative path)."""
+    return any(fnmatch(name, p) or fnmatch(rel_path, p) for p in patterns)
+
+
+def scan_markdown_files(path: Path, ignore: list[str] | None = None) -> list[ContentFile]:
+    """Recursively find markdown files in a single os.scandir pass.
+
+    Stat information comes from the directory entries, so callers can
+    compare mtime and size without extra syscalls. `ignore` patterns are
+    added to DEFAULT_IGNORE rather than replacing it.
+    """
     if not path.exists():
         return []
-    return sorted(path.glob('*.md'))
+    patterns = DEFAULT_IGNORE + list(ignore or [])
+
+    found = []
+    stack = [(str(path), '')]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if _is_ignored(entry.name, rel_path, patterns):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel_path + '/'))
+                elif entry.name.endswith('.md') and entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    found.append(ContentFile(
+                        path=Path(entry.path),
+                        rel_path=rel_path,
+                        mtime=stat.st_mtime,
+                        size=stat.st_size
+                    ))
+
+    found.sort(key=lambda f: f.rel_path)
+    return found
+
+
+def list_markdown_files(path: Path, ignore: list[str] | None = None) -> list[Path]:
+    """List all markdown files under a directory, recursively."""
+    return [f.path for f in scan_markdown_files(path, ignore)]
 
 
 def copy_images(content_dir: Path, output_dir: Path) -> None:
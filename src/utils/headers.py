@@ -0,0 +1,111 @@
+"""Cache-control policy and host header files derived from the output manifest.
+
+Admin uploads are named by their content hash and never change, so they
+are cached for a year as immutable. Documents (HTML, feeds, JSON) must be
+revalidated on every request. Other static assets get a one-day TTL.
+
+Hosts cap the number of `_headers` rules (Cloudflare Pages allows 100) and
+merge the values of every rule that matches a URL, so rules are written per
+class of file with globs that never overlap, not per file. ETags are left to
+the host, which computes them for every static file it serves.
+"""
+import re
+from collections import defaultdict
+from pathlib import PurePosixPath
+
+from src.utils.manifest import guess_content_type
+
+# Admin uploads: images/<20 hex><ext> and images/variants/<20 hex>-<width><ext>
+FINGERPRINT_PATTERN = re.compile(
+    r'images/(?:[0-9a-f]{20}|variants/[0-9a-f]{20}-[0-9]+)\.[A-Za-z0-9]+'
+)
+DOCUMENT_TYPES = ('text/html', 'application/xml', 'application/json', 'text/plain')
+MAX_RULES = 100
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=0, must-revalidate'
+ASSET = 'public, max-age=86400'
+
+
+def is_fingerprinted(rel_path: str) -> bool:
+    """True if the file is an admin upload named by its content hash."""
+    return bool(FINGERPRINT_PATTERN.fullmatch(rel_path))
+
+
+def is_document(content_type: str) -> bool:
+    return content_type.startswith(DOCUMENT_TYPES)
+
+
+def cache_control(rel_path: str, content_type: str | None = None) -> str:
+    """Cache-Control value for an output file."""
+    content_type = content_type or guess_content_type(rel_path)
+    if is_document(content_type):
+        return REVALIDATE
+    if is_fingerprinted(rel_path):
+        return IMMUTABLE
+    return ASSET
+
+
+def header_rules(manifest: dict[str, dict]) -> list[tuple[str, str]]:
+    """Return (URL pattern, Cache-Control) rules covering every file in the manifest.
+
+    Documents are matched by extension (`/*.html`, plus `/` and `/*/` for
+    index pages). Other files are matched by the outermost directories whose
+    whole subtree shares one policy and holds no documents (`/images/*`);
+    only files in mixed directories get a rule of their own.
+    """
+    rules = []
+    doc_suffixes = set()
+    others = {}
+    for rel_path, entry in manifest.items():
+        if is_document(entry['type']):
+            doc_suffixes.add(PurePosixPath(rel_path).suffix)
+        else:
+            others[rel_path] = cache_control(rel_path, entry['type'])
+
+    # A document without a suffix cannot be globbed by extension
+    for rel_path, entry in manifest.items():
+        if is_document(entry['type']) and not PurePosixPath(rel_path).suffix:
+            rules.append((f"/{rel_path}", REVALIDATE))
+    for suffix in sorted(s for s in doc_suffixes if s):
+        rules.append((f"/*{suffix}", REVALIDATE))
+    if 'index.html' in manifest:
+        rules.append(('/', REVALIDATE))
+    if any(path.endswith('/index.html') for path in manifest):
+        rules.append(('/*/', REVALIDATE))
+
+    # Directory -> policies of all non-document files beneath it, and
+    # directories that contain a document somewhere beneath them
+    policies = defaultdict(set)
+    has_documents = set()
+    for rel_path, entry in manifest.items():
+        parents = [str(p) for p in PurePosixPath(rel_path).parents if str(p) != '.']
+        if is_document(entry['type']):
+            has_documents.update(parents)
+        else:
+            for parent in parents:
+                policies[parent].add(others[rel_path])
+
+    def uniform(directory: str) -> bool:
+        return directory not in has_documents and len(policies[directory]) == 1
+
+    covered = set()
+    for rel_path, policy in sorted(others.items()):
+        parents = [str(p) for p in PurePosixPath(rel_path).parents if str(p) != '.']
+        # Outermost uniform directory, so one glob covers as much as possible
+        outer = next((d for d in reversed(parents) if uniform(d)), None)
+        if outer is None:
+            rules.append((f"/{rel_path}", policy))
+        elif outer not in covered:
+            covered.add(outer)
+            rules.append((f"/{outer}/*", policy))
+    return rules
+
+
+def render_headers_file(rules: list[tuple[str, str]]) -> str:
+    """Render a `_headers` file (Netlify / Cloudflare Pages syntax) from header_rules()."""
+    lines = ['# Generated from the output manifest; do not edit.']
+    for pattern, policy in rules:
+        lines.append(pattern)
+        lines.append(f"  Cache-Control: {policy}")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,128 @@
+"""Output manifests: a content hash, size and type for every file in a build."""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+SKIP_NAMES = {'.git'}
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+    '.xml': 'application/xml',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.ico': 'image/x-icon',
+}
+
+
+def guess_content_type(path: str) -> str:
+    """Return the content type for a file based on its extension."""
+    return CONTENT_TYPES.get(Path(path).suffix.lower(), 'application/octet-stream')
+
+
+@dataclass
+class ManifestDiff:
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    bytes_changed: int = 0
+
+    @property
+    def changed(self) -> list[str]:
+        """Paths that need to be staged (including deletions)."""
+        return self.added + self.modified + self.deleted
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.deleted)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.modified)} modified, "
+            f"{len(self.deleted)} deleted ({self.bytes_changed} bytes)"
+        )
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk_files(root: Path):
+    """Yield (relative posix path, DirEntry) for every regular file under root."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.name in SKIP_NAMES or entry.is_symlink():
+                    continue
+                if entry.is_dir():
+                    stack.append(Path(entry.path))
+                elif entry.is_file():
+                    rel = Path(entry.path).relative_to(root).as_posix()
+                    yield rel, entry
+
+
+def manifest_entry(path: Path, rel_path: str) -> dict:
+    """Manifest entry (hash, size, content type) for a single file."""
+    return {
+        'hash': hash_file(path),
+        'size': path.stat().st_size,
+        'type': guess_content_type(rel_path),
+    }
+
+
+def build_manifest(root: Path) -> dict[str, dict]:
+    """Map each output file (relative path) to its hash, size and content type."""
+    manifest = {}
+    if not root.exists():
+        return manifest
+    for rel, entry in _walk_files(root):
+        manifest[rel] = {
+            'hash': hash_file(Path(entry.path)),
+            'size': entry.stat().st_size,
+            'type': guess_content_type(rel),
+        }
+    return dict(sorted(manifest.items()))
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Load a stored manifest, returning an empty one if missing or corrupt."""
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: Path, manifest: dict[str, dict]) -> None:
+    """Write a manifest as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+
+
+def diff_manifests(old: dict[str, dict], new: dict[str, dict]) -> ManifestDiff:
+    """Compare two manifests and list added, modified and deleted paths."""
+    diff = ManifestDiff()
+    for path, entry in new.items():
+        previous = old.get(path)
+        if previous is None:
+            diff.added.append(path)
+            diff.bytes_changed += entry['size']
+        elif previous['hash'] != entry['hash']:
+            diff.modified.append(path)
+            diff.bytes_changed += entry['size']
+    diff.deleted = sorted(set(old) - set(new))
+    return diff
@@ -0,0 +1,99 @@
+"""Background writer that overlaps output file writes with rendering."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class OutputWriter:
+    """Write build outputs on a thread pool.
+
+    Directories are created once and remembered, pending writes are
+    bounded so rendering cannot run arbitrarily far ahead of the disk,
+    and close() waits for every write and raises if any failed. With
+    fsync enabled, files and directories are synced in one batch at
+    close() rather than after each write, so rendering never waits on it.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 256, fsync: bool = False):
+        self.fsync = fsync
+        self.workers = max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self._created_dirs: set[Path] = set()
+        self._written: list[Path] = []
+        self.failures: list[tuple[Path, Exception]] = []
+
+    def _ensure_dir(self, directory: Path) -> None:
+        with self._lock:
+            if directory in self._created_dirs:
+                return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._created_dirs.add(directory)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        try:
+            self._ensure_dir(path.parent)
+            with open(path, 'wb') as f:
+                f.write(data)
+            if self.fsync:
+                with self._lock:
+                    self._written.append(path)
+        except Exception as e:
+            with self._lock:
+                self.failures.append((path, e))
+        finally:
+            self._slots.release()
+
+    def write(self, path: Path, content: str) -> None:
+        """Queue content to be written to path (UTF-8)."""
+        data = content.encode('utf-8')
+        self._slots.acquire()
+        self._pool.submit(self._write, path, data)
+
+    def _fsync_path(self, path: Path, flags: int = os.O_RDONLY) -> None:
+        try:
+            fd = os.open(path, flags)
+        except OSError as e:
+            with self._lock:
+                self.failures.append((path, e))
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            with self._lock:
+                self.failures.append((path, e))
+        finally:
+            os.close(fd)
+
+    def _fsync_all(self) -> None:
+        """Sync every written file, then the directories holding them."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(self._fsync_path, self._written))
+        if hasattr(os, 'O_DIRECTORY'):
+            for directory in self._created_dirs:
+                self._fsync_path(directory, os.O_RDONLY | os.O_DIRECTORY)
+
+    def close(self) -> None:
+        """Wait for all queued writes, fsync if enabled, and raise on any failure."""
+        self._pool.shutdown(wait=True)
+        if self.fsync:
+            self._fsync_all()
+
+        if self.failures:
+            for path, error in self.failures:
+                print(f"Error writing {path}: {error}")
+            raise OSError(f"{len(self.failures)} output file(s) could not be written")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # The build failed: drop queued writes, keep none of the workers
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        return False